@@ -1,21 +1,31 @@
-from flasgger import Swagger
 from flask import Flask
-from flask_cors import CORS
 from backend.config import settings
 from backend.repositories.user_store import UserStore
 from backend.repositories.portfolio_store import PortfolioStore
 from backend.repositories.user_store_dynamo import UserStoreDynamo
 from backend.repositories.portfolio_store_dynamo import PortfolioStoreDynamo
+from backend.repositories.sqlite_db import SQLiteDatabase
+from backend.repositories.user_store_sqlite import UserStoreSqlite
+from backend.repositories.portfolio_store_sqlite import PortfolioStoreSqlite
+from backend.repositories.networth_store import NetWorthStore
+from backend.repositories.networth_store_dynamo import NetWorthStoreDynamo
 from backend.services.auth_service import AuthService
 from backend.services.notification_service import NotificationService
 from backend.services.trade_service import TradingService
 from backend.services.portfolio_service import PortfolioService
+from backend.services.profiler_service import SamplingProfiler
+from backend.services.snapshot_service import NetWorthSnapshotService
+from backend.services.portfolio_stream_service import PortfolioStreamHub
+from backend.services.indian_market_service import get_market_hours_policy
 from backend.routes.auth_routes import create_auth_routes
 from backend.routes.market_routes import create_market_routes
 from backend.routes.trading_routes import create_trading_routes
 from backend.routes.portfolio_routes import create_portfolio_routes
+from backend.routes.admin_routes import create_admin_routes
 
 def create_app():
+    from flask_cors import CORS
+
     app = Flask(__name__)
     CORS(app, supports_credentials=True, origins=["http://localhost:3000","http://100.53.27.45:3000"])
     app.secret_key = settings.SECRET_KEY
@@ -25,24 +35,70 @@ def create_app():
         print("using dynamodb")
         user_store = UserStoreDynamo()
         portfolio_store = PortfolioStoreDynamo()
+        networth_store = NetWorthStoreDynamo(settings.DYNAMODB_TABLE_NETWORTH)
+    elif settings.LOCAL_DB_PATH:
+        notification_service = NotificationService(None)
+        print(f"using sqlite at {settings.LOCAL_DB_PATH}")
+        db = SQLiteDatabase(settings.LOCAL_DB_PATH)
+        user_store = UserStoreSqlite(db)
+        portfolio_store = PortfolioStoreSqlite(db)
+        networth_store = NetWorthStore(settings.SNAPSHOT_DIR)
     else:
         notification_service = NotificationService(None)
         print("using local dictionaries")
         user_store = UserStore()
         portfolio_store = PortfolioStore()
+        networth_store = NetWorthStore(settings.SNAPSHOT_DIR)
 
 
-    auth_service = AuthService(user_store)
+    auth_service = AuthService(user_store, portfolio_store=portfolio_store)
     portfolio_service = PortfolioService(portfolio_store)
-    trading_service = TradingService(portfolio_service)
+    stream_hub = PortfolioStreamHub(
+        portfolio_service,
+        poll_interval=settings.PORTFOLIO_STREAM_POLL_SECONDS,
+        resync_interval=settings.PORTFOLIO_STREAM_RESYNC_SECONDS,
+        queue_size=settings.PORTFOLIO_STREAM_QUEUE_SIZE
+    )
+    trading_service = TradingService(portfolio_service, stream_hub=stream_hub)
+    # Only serve /portfolio/history when something records it
+    snapshot_service = None
+    if settings.SNAPSHOT_ENABLED == 'True':
+        snapshot_service = NetWorthSnapshotService(
+            portfolio_store,
+            networth_store,
+            interval=settings.SNAPSHOT_INTERVAL_SECONDS,
+            flat_interval=settings.SNAPSHOT_FLAT_INTERVAL_SECONDS
+        )
+        snapshot_service.start()
+
+    # Closing snapshot at session end, warm-up before the open
+    market_hours = get_market_hours_policy()
+    if market_hours is not None:
+        market_hours.start()
     # Register routes
     auth_routes = create_auth_routes(auth_service)
     app.register_blueprint(auth_routes, url_prefix="/auth")
     app.register_blueprint(create_market_routes(), url_prefix="/market")
     app.register_blueprint(create_trading_routes(trading_service), url_prefix="/trade")
-    app.register_blueprint(create_portfolio_routes(portfolio_service), url_prefix="/portfolio")
+    app.register_blueprint(create_portfolio_routes(portfolio_service, snapshot_service, stream_hub), url_prefix="/portfolio")
 
-    Swagger(app)
+    # Opt-in sampling profiler (admin-triggered or via SIGUSR2)
+    profiler = None
+    if settings.PROFILER_ENABLED == 'True':
+        profiler = SamplingProfiler(
+            settings.PROFILER_OUTPUT_DIR,
+            default_rate_hz=settings.PROFILER_SAMPLE_RATE_HZ,
+            default_duration=settings.PROFILER_DURATION_SECONDS,
+            max_duration=settings.PROFILER_MAX_DURATION_SECONDS
+        )
+        profiler.init_app(app)
+        profiler.install_signal_handler()
+    app.register_blueprint(create_admin_routes(profiler), url_prefix="/admin")
+
+    # Building the Swagger spec walks every route; skip it where docs aren't served
+    if settings.SWAGGER_ENABLED == 'True':
+        from flasgger import Swagger
+        Swagger(app)
 
     @app.route("/")
     def home():
@@ -54,7 +110,5 @@ def create_app():
     return app
 
 
-app = create_app()
-
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=4000, debug=True)
\ No newline at end of file
+    create_app().run(host="0.0.0.0", port=4000, debug=True)
\ No newline at end of file
@@ -1,9 +1,9 @@
-import boto3
 import os
 from backend.config import settings
 class AWSClientFactory:
     @staticmethod
     def dynamodb():
+        import boto3
         return boto3.resource(
             "dynamodb",
             region_name= settings.AWS_REGION,
@@ -11,6 +11,7 @@ class AWSClientFactory:
 
     @staticmethod
     def sns():
+        import boto3
         return boto3.client(
             "sns",
             region_name= settings.AWS_REGION,
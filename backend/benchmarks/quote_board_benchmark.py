@@ -0,0 +1,102 @@
+"""
+Read-throughput benchmark for the shared quote board.
+
+Starts one writer process that republishes every symbol in a tight loop
+(worst case for seqlock retries) and N reader processes that read random
+symbols for a fixed time, then reports aggregate and per-reader reads/sec.
+
+Usage (from the repository root)::
+
+    python -m backend.benchmarks.quote_board_benchmark [--readers 8] [--symbols 500] [--seconds 3]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+from backend.services.quote_board import QuoteBoardWriter, QuoteBoardReader
+
+
+def _symbols(count):
+    return [f"SYM{i:04d}" for i in range(count)]
+
+
+def _writer(path, symbols, stop):
+    board = QuoteBoardWriter(path)
+    price = 100.0
+    while not stop.is_set():
+        for symbol in symbols:
+            price += 0.01
+            board.publish({"symbol": symbol, "price": price, "volume": 1})
+
+
+def _reader(path, symbols, seconds, results):
+    board = QuoteBoardReader(path)
+    rng = random.Random(os.getpid())
+    picks = [rng.choice(symbols) for _ in range(4096)]
+
+    reads = misses = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        for symbol in picks[:256]:
+            if board.get(symbol) is None:
+                misses += 1
+        reads += 256
+        picks = picks[256:] + picks[:256]
+    results.put((reads, misses))
+
+
+def run(readers, symbol_count, seconds, with_writer=True):
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    path = os.path.join(directory, f"quote_board_bench_{os.getpid()}")
+    symbols = _symbols(symbol_count)
+
+    board = QuoteBoardWriter(path, capacity=symbol_count)
+    for symbol in symbols:
+        board.publish({"symbol": symbol, "price": 100.0, "volume": 1})
+
+    stop = multiprocessing.Event()
+    writer = multiprocessing.Process(target=_writer, args=(path, symbols, stop))
+    if with_writer:
+        writer.start()
+
+    results = multiprocessing.Queue()
+    procs = [multiprocessing.Process(target=_reader, args=(path, symbols, seconds, results)) for _ in range(readers)]
+    for p in procs:
+        p.start()
+    counts = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+
+    stop.set()
+    if with_writer:
+        writer.join()
+    board.close()
+    os.unlink(path)
+
+    total_reads = sum(r for r, _ in counts)
+    total_misses = sum(m for _, m in counts)
+    return total_reads / seconds, total_misses
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args(argv)
+
+    for with_writer in (False, True):
+        rate, misses = run(args.readers, args.symbols, args.seconds, with_writer)
+        label = "with concurrent writer" if with_writer else "read-only"
+        print(
+            f"{args.readers} readers, {args.symbols} symbols, {label}: "
+            f"{rate:,.0f} reads/s total, {rate / args.readers:,.0f} reads/s per reader, "
+            f"{misses} retries exhausted"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Startup-time benchmark for the backend.
+
+Runs ``import backend.app`` and ``create_app()`` in fresh interpreters (so the
+module cache is cold every time) and reports:
+
+* wall-clock time for the import and for building the app
+* a per-module import-time breakdown from ``python -X importtime``
+
+Usage (from the repository root)::
+
+    python -m backend.benchmarks.startup_benchmark [--runs 5] [--top 20]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TIMING_SNIPPET = """
+import time
+t0 = time.perf_counter()
+import backend.app
+t1 = time.perf_counter()
+backend.app.create_app()
+t2 = time.perf_counter()
+print(f"{t1 - t0} {t2 - t1}")
+"""
+
+
+def _run_python(args):
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+
+def measure_wall_clock(runs):
+    import_times, create_times = [], []
+    for _ in range(runs):
+        out = _run_python(["-c", TIMING_SNIPPET]).stdout.strip().splitlines()[-1]
+        import_s, create_s = (float(x) for x in out.split())
+        import_times.append(import_s)
+        create_times.append(create_s)
+    return import_times, create_times
+
+
+def import_breakdown():
+    """
+    Parse ``-X importtime`` output into cumulative microseconds per module.
+
+    Returns ``(by_module, by_package)`` where ``by_package`` groups modules
+    by their top-level package (``pandas.core.frame`` → ``pandas``) and only
+    counts modules imported directly by a module outside that package, so
+    nested imports are not double counted.
+    """
+    stderr = _run_python(["-X", "importtime", "-c", "import backend.app"]).stderr
+
+    entries = []  # (depth, module, cumulative us), children listed before parents
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        fields = line[len("import time:"):].split("|")
+        raw_name = fields[2][1:]
+        depth = (len(raw_name) - len(raw_name.lstrip(" "))) // 2
+        entries.append((depth, raw_name.strip(), int(fields[1])))
+
+    by_module = {name: us for _, name, us in entries}
+    by_package = defaultdict(int)
+
+    # Reversed, the list is parents-first, so a stack gives each module's importer
+    stack = []
+    for depth, name, cumulative_us in reversed(entries):
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        package = name.split(".")[0]
+        parent_package = stack[-1][1].split(".")[0] if stack else None
+        if parent_package != package:
+            by_package[package] += cumulative_us
+        stack.append((depth, name))
+
+    return by_module, dict(by_package)
+
+
+def _fmt_ms(seconds):
+    return f"{seconds * 1000:8.1f} ms"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time (default: 5)")
+    parser.add_argument("--top", type=int, default=20, help="modules/packages to list (default: 20)")
+    args = parser.parse_args(argv)
+
+    import_times, create_times = measure_wall_clock(args.runs)
+    print(f"Cold start over {args.runs} runs (median / max)")
+    print(f"  import backend.app : {_fmt_ms(statistics.median(import_times))} / {_fmt_ms(max(import_times))}")
+    print(f"  create_app()       : {_fmt_ms(statistics.median(create_times))} / {_fmt_ms(max(create_times))}")
+
+    by_module, by_package = import_breakdown()
+
+    print(f"\nTop {args.top} packages by import time (cumulative)")
+    for package, us in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+        print(f"  {_fmt_ms(us / 1e6)}  {package}")
+
+    backend_modules = {m: us for m, us in by_module.items() if m.startswith("backend.")}
+    print("\nbackend.* modules by import time (cumulative)")
+    for module, us in sorted(backend_modules.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+        print(f"  {_fmt_ms(us / 1e6)}  {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,10 +8,54 @@ class Settings:
     # Core App
     ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
     SECRET_KEY = os.getenv("SECRET_KEY", "dev-secret-key")
+    SWAGGER_ENABLED = os.getenv("SWAGGER_ENABLED", "True")
 
     # Stock
     ALPHAVANTAGE_API_KEY = os.getenv("ALPHAVANTAGE_API_KEY")
 
+    # Symbol universe (NSE EQUITY_L.csv format) used for search and validation
+    NSE_SYMBOLS_PATH = os.getenv(
+        "NSE_SYMBOLS_PATH",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "nse_symbols.csv")
+    )
+    # The bundled listing is only a subset, so validation defaults on only
+    # when a full listing is configured explicitly
+    SYMBOL_VALIDATION = os.getenv("SYMBOL_VALIDATION", "True" if os.getenv("NSE_SYMBOLS_PATH") else "False")
+    NEGATIVE_CACHE_TTL_SECONDS = float(os.getenv("NEGATIVE_CACHE_TTL_SECONDS", 300))
+
+    # Quote fetching: per-request latency budget, hedging and circuit breaking
+    QUOTE_DEADLINE_SECONDS = float(os.getenv("QUOTE_DEADLINE_SECONDS", 2.0))
+    TRADE_QUOTE_DEADLINE_SECONDS = float(os.getenv("TRADE_QUOTE_DEADLINE_SECONDS", 5.0))
+    QUOTE_HEDGE_AFTER_SECONDS = float(os.getenv("QUOTE_HEDGE_AFTER_SECONDS", 0.75))
+    QUOTE_FETCH_WORKERS = int(os.getenv("QUOTE_FETCH_WORKERS", 16))
+    QUOTE_TRADE_FETCH_WORKERS = int(os.getenv("QUOTE_TRADE_FETCH_WORKERS", 4))
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+    CIRCUIT_RESET_SECONDS = float(os.getenv("CIRCUIT_RESET_SECONDS", 30))
+
+    # Upstream request budget (token bucket; 0 disables) split by priority:
+    # trades > portfolio views > dashboard reads
+    UPSTREAM_RATE_PER_SECOND = float(os.getenv("UPSTREAM_RATE_PER_SECOND", 10))
+    UPSTREAM_BURST = float(os.getenv("UPSTREAM_BURST", 20))
+    UPSTREAM_TRADE_RESERVE = float(os.getenv("UPSTREAM_TRADE_RESERVE", 2))
+    UPSTREAM_PORTFOLIO_MAX_WAIT_SECONDS = float(os.getenv("UPSTREAM_PORTFOLIO_MAX_WAIT_SECONDS", 0.5))
+    UPSTREAM_DASHBOARD_MAX_WAIT_SECONDS = float(os.getenv("UPSTREAM_DASHBOARD_MAX_WAIT_SECONDS", 0))
+    UPSTREAM_BUCKET_PATH = os.getenv("UPSTREAM_BUCKET_PATH", "/tmp/upstream_bucket")
+
+    # NSE market hours: outside the session quotes come from the closing snapshot
+    MARKET_HOURS_ENABLED = os.getenv("MARKET_HOURS_ENABLED", "True")
+    NSE_OPEN_TIME = os.getenv("NSE_OPEN_TIME", "09:15")
+    NSE_CLOSE_TIME = os.getenv("NSE_CLOSE_TIME", "15:30")
+    NSE_HOLIDAYS = os.getenv("NSE_HOLIDAYS", "")  # comma-separated YYYY-MM-DD
+    CLOSING_SNAPSHOT_PATH = os.getenv("CLOSING_SNAPSHOT_PATH", "data/closing_snapshot.json")
+    MARKET_SNAPSHOT_DELAY_MINUTES = float(os.getenv("MARKET_SNAPSHOT_DELAY_MINUTES", 5))
+    MARKET_WARMUP_MINUTES = float(os.getenv("MARKET_WARMUP_MINUTES", 10))
+
+    # Shared quote board (empty disables it; e.g. /dev/shm/quote_board)
+    QUOTE_BOARD_PATH = os.getenv("QUOTE_BOARD_PATH", "")
+    QUOTE_BOARD_SYMBOLS = os.getenv("QUOTE_BOARD_SYMBOLS", "")
+    QUOTE_BOARD_REFRESH_SECONDS = float(os.getenv("QUOTE_BOARD_REFRESH_SECONDS", 5))
+    QUOTE_BOARD_MAX_AGE_SECONDS = float(os.getenv("QUOTE_BOARD_MAX_AGE_SECONDS", 30))
+
     # JWT
     JWT_EXPIRY_HOURS = int(os.getenv("JWT_EXPIRY_HOURS", 6))
 
@@ -19,13 +63,41 @@ class Settings:
     USE_AWS = os.getenv("USE_AWS", False)
     AWS_REGION = os.getenv("AWS_REGION", "ap-south-1")
 
+    # Local persistence (used when USE_AWS is off). Empty keeps per-process
+    # dictionaries; a file path enables the shared SQLite store so several
+    # workers on one box see the same users and portfolios.
+    LOCAL_DB_PATH = os.getenv("LOCAL_DB_PATH", "")
+
     # DynamoDB Tables
     DYNAMODB_TABLE_USERS = os.getenv("DYNAMODB_TABLE_USERS", "UsersTable")
     DYNAMODB_TABLE_TRADES = os.getenv("DYNAMODB_TABLE_TRADES", "TradesTable")
+    DYNAMODB_TABLE_NETWORTH = os.getenv("DYNAMODB_TABLE_NETWORTH", "NetWorthHistory")
+
+    # Net-worth snapshots (portfolio history chart)
+    SNAPSHOT_ENABLED = os.getenv("SNAPSHOT_ENABLED", False)
+    SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "data/networth")
+    SNAPSHOT_INTERVAL_SECONDS = int(os.getenv("SNAPSHOT_INTERVAL_SECONDS", 60))
+    SNAPSHOT_FLAT_INTERVAL_SECONDS = int(os.getenv("SNAPSHOT_FLAT_INTERVAL_SECONDS", 3600))
+
+    # Live portfolio stream (/portfolio/stream)
+    PORTFOLIO_STREAM_POLL_SECONDS = float(os.getenv("PORTFOLIO_STREAM_POLL_SECONDS", 2))
+    PORTFOLIO_STREAM_RESYNC_SECONDS = float(os.getenv("PORTFOLIO_STREAM_RESYNC_SECONDS", 30))
+    PORTFOLIO_STREAM_KEEPALIVE_SECONDS = float(os.getenv("PORTFOLIO_STREAM_KEEPALIVE_SECONDS", 15))
+    PORTFOLIO_STREAM_QUEUE_SIZE = int(os.getenv("PORTFOLIO_STREAM_QUEUE_SIZE", 100))
 
     # SNS
     SNS_TOPIC_ARN = os.getenv("SNS_TOPIC_ARN", "")
 
+    # Admin
+    ADMIN_USERNAMES = [u.strip() for u in os.getenv("ADMIN_USERNAMES", "").split(",") if u.strip()]
+
+    # Profiling
+    PROFILER_ENABLED = os.getenv("PROFILER_ENABLED", False)
+    PROFILER_OUTPUT_DIR = os.getenv("PROFILER_OUTPUT_DIR", "profiles")
+    PROFILER_SAMPLE_RATE_HZ = int(os.getenv("PROFILER_SAMPLE_RATE_HZ", 100))
+    PROFILER_DURATION_SECONDS = int(os.getenv("PROFILER_DURATION_SECONDS", 60))
+    PROFILER_MAX_DURATION_SECONDS = int(os.getenv("PROFILER_MAX_DURATION_SECONDS", 300))
+
 
 # Singleton settings object
 settings = Settings()
\ No newline at end of file
@@ -1,4 +1,5 @@
 from flask import request, jsonify, g
+from backend.config import settings
 from backend.services.token_service import TokenService
 import functools
 
@@ -39,4 +40,18 @@ def jwt_required(func):
                 "message": "Token verification failed. Please log in again."
             }), 401
 
+    return wrapper
+
+def admin_required(func):
+    @functools.wraps(func)
+    @jwt_required
+    def wrapper(*args, **kwargs):
+        if g.username not in settings.ADMIN_USERNAMES:
+            return jsonify({
+                "error": "Forbidden",
+                "message": "Admin privileges required."
+            }), 403
+
+        return func(*args, **kwargs)
+
     return wrapper
\ No newline at end of file
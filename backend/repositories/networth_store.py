@@ -0,0 +1,91 @@
+import fcntl
+import os
+import re
+from backend.utils.delta_codec import encode_record, decode
+
+WIDTH = 3  # (timestamp seconds, net worth paise, cash paise)
+
+
+def to_record(timestamp, net_worth, cash):
+    return int(timestamp), round(net_worth * 100), round(cash * 100)
+
+
+def from_record(record):
+    timestamp, net_worth, cash = record
+    return timestamp, net_worth / 100, cash / 100
+
+
+def should_append(last, record, min_interval, flat_interval):
+    """Skip near-duplicate points and unchanged values within ``flat_interval``."""
+    if last is None:
+        return True
+    elapsed = record[0] - last[0]
+    if elapsed < min_interval:
+        return False
+    if flat_interval and record[1:] == last[1:] and elapsed < flat_interval:
+        return False
+    return True
+
+
+class NetWorthStore:
+    """
+    Local append-only net-worth history: one delta-encoded file per user.
+
+    Appends take an exclusive flock, so several workers can run the
+    snapshotter against the same directory; the ``min_interval`` check
+    under the lock keeps them from recording the same tick twice.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._tails = {}  # username → (file size, last record)
+
+    def _path(self, username):
+        safe = re.sub(r"[^A-Za-z0-9_.-]", lambda m: f"%{ord(m.group()):02x}", username)
+        return os.path.join(self.directory, f"{safe}.nws")
+
+    def append(self, username, timestamp, net_worth, cash, min_interval=0, flat_interval=None):
+        record = to_record(timestamp, net_worth, cash)
+        os.makedirs(self.directory, exist_ok=True)
+
+        with open(self._path(username), "ab+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                size = os.fstat(f.fileno()).st_size
+                tail = self._tails.get(username)
+
+                # Another process appended since our last write; re-read the tail
+                if tail is None or tail[0] != size:
+                    f.seek(0)
+                    records, consumed = decode(f.read(), WIDTH)
+                    if consumed < size:
+                        f.truncate(consumed)
+                        size = consumed
+                    tail = (size, records[-1] if records else None)
+
+                last = tail[1]
+                if not should_append(last, record, min_interval, flat_interval):
+                    self._tails[username] = tail
+                    return False
+
+                data = encode_record(record, last)
+                f.write(data)
+                f.flush()
+                self._tails[username] = (size + len(data), record)
+                return True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def read(self, username, start=None, end=None):
+        try:
+            with open(self._path(username), "rb") as f:
+                fcntl.flock(f, fcntl.LOCK_SH)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+
+        records, _ = decode(data, WIDTH)
+        return [
+            from_record(r) for r in records
+            if (start is None or r[0] >= start) and (end is None or r[0] <= end)
+        ]
@@ -0,0 +1,107 @@
+from backend.aws.aws_client import AWSClientFactory
+from backend.repositories.networth_store import WIDTH, to_record, from_record, should_append
+from backend.utils.delta_codec import encode_record, decode
+
+SECONDS_PER_DAY = 86400
+
+
+class NetWorthStoreDynamo:
+    """
+    Net-worth history in DynamoDB: one item per user per UTC day
+    (``username`` hash key, ``day`` range key). Each item holds the day's
+    delta-encoded records as a list of binary chunks, appended with
+    ``list_append``, plus the last record so the next delta can be computed.
+    The first record of each day is stored against zero, so days decode
+    independently.
+    """
+
+    def __init__(self, table_name="NetWorthHistory"):
+        self.table_name = table_name
+        self._table = None
+        self._last = {}  # username → (day, last record); only the current day is kept
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = AWSClientFactory.dynamodb().Table(self.table_name)
+        return self._table
+
+    def _last_record(self, username, day):
+        cached = self._last.get(username)
+        if cached is not None and cached[0] == day:
+            return cached[1]
+
+        item = self.table.get_item(Key={"username": username, "day": day}).get("Item")
+        record = (int(item["last_ts"]), int(item["last_net_worth"]), int(item["last_cash"])) if item else None
+        self._last[username] = (day, record)
+        return record
+
+    def append(self, username, timestamp, net_worth, cash, min_interval=0, flat_interval=None):
+        from botocore.exceptions import ClientError
+
+        record = to_record(timestamp, net_worth, cash)
+        day = record[0] // SECONDS_PER_DAY
+        last = self._last_record(username, day)
+
+        if not should_append(last, record, min_interval, flat_interval):
+            return False
+
+        values = {
+            ":empty": [],
+            ":chunk": [encode_record(record, last)],
+            ":ts": record[0],
+            ":nw": record[1],
+            ":cash": record[2],
+        }
+        if last is None:
+            condition = "attribute_not_exists(last_ts)"
+        else:
+            condition = "last_ts = :prev_ts"
+            values[":prev_ts"] = last[0]
+
+        try:
+            self.table.update_item(
+                Key={"username": username, "day": day},
+                UpdateExpression=(
+                    "SET deltas = list_append(if_not_exists(deltas, :empty), :chunk), "
+                    "last_ts = :ts, last_net_worth = :nw, last_cash = :cash"
+                ),
+                ConditionExpression=condition,
+                ExpressionAttributeValues=values
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            # Another writer got there first; reload the tail next time
+            self._last.pop(username, None)
+            return False
+
+        self._last[username] = (day, record)
+        return True
+
+    def read(self, username, start=None, end=None):
+        first_day = int(start) // SECONDS_PER_DAY if start is not None else 0
+        last_day = int(end) // SECONDS_PER_DAY if end is not None else 2 ** 31
+
+        query = {
+            "KeyConditionExpression": "username = :u AND #day BETWEEN :a AND :b",
+            "ExpressionAttributeNames": {"#day": "day"},
+            "ExpressionAttributeValues": {":u": username, ":a": first_day, ":b": last_day},
+            "ProjectionExpression": "deltas",
+        }
+
+        series = []
+        while True:
+            res = self.table.query(**query)
+            for item in res.get("Items", []):
+                data = b"".join(bytes(chunk) for chunk in item.get("deltas", []))
+                records, _ = decode(data, WIDTH)
+                series.extend(
+                    from_record(r) for r in records
+                    if (start is None or r[0] >= start) and (end is None or r[0] <= end)
+                )
+            if "LastEvaluatedKey" not in res:
+                break
+            query["ExclusiveStartKey"] = res["LastEvaluatedKey"]
+
+        return series
@@ -1,11 +1,25 @@
+import threading
+from contextlib import contextmanager
 from backend.models.portfolio import Portfolio
 
 
 class PortfolioStore:
     def __init__(self):
         self.portfolios = {}  # username → Portfolio
+        self._lock = threading.RLock()
 
     def get_or_create(self, username):
         if username not in self.portfolios:
             self.portfolios[username] = Portfolio(username)
-        return self.portfolios[username]
\ No newline at end of file
+        return self.portfolios[username]
+
+    def usernames(self):
+        return list(self.portfolios)
+
+    def save(self, portfolio: Portfolio):
+        self.portfolios[portfolio.username] = portfolio
+
+    @contextmanager
+    def transaction(self, username):
+        with self._lock:
+            yield self.get_or_create(username)
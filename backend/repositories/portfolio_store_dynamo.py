@@ -1,10 +1,19 @@
+from contextlib import contextmanager
+from decimal import Decimal
 from backend.aws.aws_client import AWSClientFactory
 from backend.models.portfolio import Portfolio
 
 
 class PortfolioStoreDynamo:
     def __init__(self, table_name="Portfolios"):
-        self.table = AWSClientFactory.dynamodb().Table(table_name)
+        self.table_name = table_name
+        self._table = None
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = AWSClientFactory.dynamodb().Table(self.table_name)
+        return self._table
 
     def get_or_create(self, username):
         res = self.table.get_item(Key={"username": username})
@@ -15,18 +24,42 @@ class PortfolioStoreDynamo:
             self.save(portfolio)
             return portfolio
 
+        # DynamoDB returns numbers as Decimal; convert back for arithmetic
         portfolio = Portfolio(
             username=item["username"],
-            cash_balance=item["cash_balance"]
+            cash_balance=float(item["cash_balance"])
         )
-        portfolio.holdings = item.get("holdings", {})
+        portfolio.holdings = {
+            symbol: {"qty": int(h["qty"]), "avg_price": float(h["avg_price"])}
+            for symbol, h in item.get("holdings", {}).items()
+        }
         return portfolio
 
+    def usernames(self):
+        usernames = []
+        scan = {"ProjectionExpression": "username"}
+        while True:
+            res = self.table.scan(**scan)
+            usernames.extend(item["username"] for item in res.get("Items", []))
+            if "LastEvaluatedKey" not in res:
+                return usernames
+            scan["ExclusiveStartKey"] = res["LastEvaluatedKey"]
+
     def save(self, portfolio: Portfolio):
         self.table.put_item(
             Item={
                 "username": portfolio.username,
-                "cash_balance": portfolio.cash_balance,
-                "holdings": portfolio.holdings
+                "cash_balance": Decimal(str(portfolio.cash_balance)),
+                "holdings": {
+                    symbol: {"qty": h["qty"], "avg_price": Decimal(str(h["avg_price"]))}
+                    for symbol, h in portfolio.holdings.items()
+                }
             }
-        )
\ No newline at end of file
+        )
+
+    @contextmanager
+    def transaction(self, username):
+        # Read-modify-write; not isolated across writers
+        portfolio = self.get_or_create(username)
+        yield portfolio
+        self.save(portfolio)
@@ -0,0 +1,61 @@
+import json
+from contextlib import contextmanager
+from backend.models.portfolio import Portfolio
+from backend.repositories.sqlite_db import SQLiteDatabase
+
+
+class PortfolioStoreSqlite:
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    def get_or_create(self, username):
+        conn = self.db.connection()
+        portfolio = self._load(conn, username)
+        if portfolio is None:
+            with self.db.transaction() as tx:
+                portfolio = self._load_or_insert(tx, username)
+        return portfolio
+
+    def usernames(self):
+        rows = self.db.connection().execute("SELECT username FROM portfolios").fetchall()
+        return [row["username"] for row in rows]
+
+    def save(self, portfolio: Portfolio):
+        self._write(self.db.connection(), portfolio)
+
+    @contextmanager
+    def transaction(self, username):
+        # Load, mutate and write back under the database write lock so
+        # concurrent trades from different workers cannot interleave.
+        with self.db.transaction() as tx:
+            portfolio = self._load_or_insert(tx, username)
+            yield portfolio
+            self._write(tx, portfolio)
+
+    def _load_or_insert(self, conn, username):
+        portfolio = self._load(conn, username)
+        if portfolio is None:
+            portfolio = Portfolio(username)
+            self._write(conn, portfolio)
+        return portfolio
+
+    @staticmethod
+    def _load(conn, username):
+        row = conn.execute(
+            "SELECT username, cash_balance, holdings FROM portfolios WHERE username = ?",
+            (username,)
+        ).fetchone()
+
+        if not row:
+            return None
+
+        portfolio = Portfolio(username=row["username"], cash_balance=row["cash_balance"])
+        portfolio.holdings = json.loads(row["holdings"])
+        return portfolio
+
+    @staticmethod
+    def _write(conn, portfolio):
+        conn.execute(
+            "INSERT OR REPLACE INTO portfolios (username, cash_balance, holdings) VALUES (?, ?, ?)",
+            (portfolio.username, portfolio.cash_balance, json.dumps(portfolio.holdings))
+        )
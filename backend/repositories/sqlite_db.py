@@ -0,0 +1,71 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    username      TEXT PRIMARY KEY,
+    password_hash TEXT NOT NULL,
+    balance       REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS portfolios (
+    username     TEXT PRIMARY KEY,
+    cash_balance REAL NOT NULL,
+    holdings     TEXT NOT NULL
+);
+"""
+
+
+class SQLiteDatabase:
+    """
+    Shared SQLite file for the local multi-worker mode.
+
+    WAL journaling lets every gunicorn worker read concurrently while one
+    writes, and reads go through a memory-mapped view of the file. Each
+    thread (and each forked process) gets its own connection.
+    """
+
+    def __init__(self, path, busy_timeout_ms=5000, mmap_size=256 * 1024 * 1024):
+        self.path = path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.mmap_size = mmap_size
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        conn = self.connection()
+        conn.executescript(SCHEMA)
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        # A connection inherited across fork() must not be reused
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_ms / 1000, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+            conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """
+        Write transaction that takes the database write lock up front
+        (BEGIN IMMEDIATE), so read-modify-write sequences from different
+        workers are serialized instead of failing at commit time.
+        """
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
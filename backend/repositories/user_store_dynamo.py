@@ -4,7 +4,14 @@ from backend.models.user import User
 
 class UserStoreDynamo:
     def __init__(self, table_name="Users"):
-        self.table = AWSClientFactory.dynamodb().Table(table_name)
+        self.table_name = table_name
+        self._table = None
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = AWSClientFactory.dynamodb().Table(self.table_name)
+        return self._table
 
     def add_user(self, user: User):
         self.table.put_item(
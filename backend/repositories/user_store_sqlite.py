@@ -0,0 +1,28 @@
+import sqlite3
+from backend.models.user import User
+from backend.repositories.sqlite_db import SQLiteDatabase
+
+
+class UserStoreSqlite:
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    def add_user(self, user: User):
+        try:
+            self.db.connection().execute(
+                "INSERT INTO users (username, password_hash, balance) VALUES (?, ?, ?)",
+                (user.username, user.password_hash, user.balance)
+            )
+        except sqlite3.IntegrityError:
+            raise ValueError("User already exists")
+
+    def get_user(self, username):
+        row = self.db.connection().execute(
+            "SELECT username, password_hash, balance FROM users WHERE username = ?",
+            (username,)
+        ).fetchone()
+
+        if not row:
+            return None
+
+        return User(row["username"], row["password_hash"], row["balance"])
@@ -0,0 +1,39 @@
+from flask import Blueprint, request, jsonify
+from backend.middleware.auth_middleware import admin_required
+from backend.services.indian_market_service import get_quote_fetcher, get_upstream_scheduler
+
+
+def create_admin_routes(profiler=None):
+    admin_bp = Blueprint("admin", __name__)
+
+    @admin_bp.route("/upstream", methods=["GET"])
+    @admin_required
+    def upstream_metrics():
+        scheduler = get_upstream_scheduler()
+        data = scheduler.metrics() if scheduler is not None else {}
+        data["rate_limited"] = scheduler is not None
+        data["circuit"] = get_quote_fetcher().breaker.state
+        return jsonify(data), 200
+
+    if profiler is None:
+        return admin_bp
+
+    @admin_bp.route("/profiler", methods=["GET"])
+    @admin_required
+    def profiler_status():
+        return jsonify(profiler.status()), 200
+
+    @admin_bp.route("/profiler/start", methods=["POST"])
+    @admin_required
+    def start_profiler():
+        body = request.get_json(silent=True) or {}
+        try:
+            session = profiler.start(
+                duration=body.get("duration_seconds"),
+                rate_hz=body.get("rate_hz")
+            )
+            return jsonify(session), 202
+        except (ValueError, TypeError) as e:
+            return jsonify({"error": "Invalid request", "message": str(e)}), 400
+
+    return admin_bp
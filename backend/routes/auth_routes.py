@@ -2,9 +2,9 @@ from flask import Blueprint, request, jsonify, make_response
 from backend.middleware.auth_middleware import jwt_required
 from backend.config import settings
 from datetime import datetime, timedelta
-auth_bp = Blueprint("auth", __name__)
 
 def create_auth_routes(auth_service):
+    auth_bp = Blueprint("auth", __name__)
 
     @auth_bp.route("/register", methods=["POST"])
     def register():
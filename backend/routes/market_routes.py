@@ -1,19 +1,34 @@
 from flask import Blueprint, request, jsonify
 from backend.services.indian_market_service import IndianMarketService
-
-market_bp = Blueprint("market", __name__)
+from backend.services.symbol_index import get_symbol_index
 
 
 def create_market_routes():
+    market_bp = Blueprint("market", __name__)
 
     @market_bp.route("/price/<symbol>", methods=["GET"])
     def get_price(symbol):
         try:
-            data = IndianMarketService.get_stock(symbol)
+            data = IndianMarketService.get_quote(symbol)
             return jsonify(data), 200
         except Exception as e:
             return jsonify({"error": str(e)}), 400
 
+    @market_bp.route("/search", methods=["GET"])
+    def search_symbols():
+        query = request.args.get("q", "").strip()
+        if not query:
+            return jsonify({"error": "Query parameter q required"}), 400
+
+        try:
+            limit = max(1, min(int(request.args.get("limit", 10)), 50))
+        except ValueError:
+            return jsonify({"error": "limit must be a number"}), 400
+
+        index = get_symbol_index()
+        results = index.search(query, limit) if index is not None else []
+        return jsonify({"query": query, "results": results}), 200
+
     @market_bp.route("/prices", methods=["POST"])
     def get_multiple_prices():
         body = request.get_json()
@@ -21,6 +36,8 @@ def create_market_routes():
         print(symbols)
         if not symbols:
             return jsonify({"error": "Symbols list required"}), 400
+        if not isinstance(symbols, list) or not all(isinstance(s, str) for s in symbols):
+            return jsonify({"error": "Symbols must be a list of strings"}), 400
 
         data = IndianMarketService.get_multiple(symbols)
         return jsonify(data), 200
@@ -1,9 +1,35 @@
-from flask import Blueprint, jsonify, request, g
+import json
+import math
+from datetime import datetime, timezone
+from flask import Blueprint, Response, jsonify, request, g, stream_with_context
+from backend.config import settings
 from backend.middleware.auth_middleware import jwt_required
 
-portfolio_bp = Blueprint("portfolio", __name__)
 
-def create_portfolio_routes(portfolio_service):
+def _parse_time(value):
+    """Accept epoch seconds or an ISO-8601 timestamp (UTC)."""
+    if value is None:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        parsed = datetime.fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+
+    # float() also accepts "inf" and "nan"
+    if not math.isfinite(seconds):
+        raise ValueError(f"Invalid timestamp {value!r}")
+    return seconds
+
+
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def create_portfolio_routes(portfolio_service, snapshot_service=None, stream_hub=None):
+    portfolio_bp = Blueprint("portfolio", __name__)
 
     @portfolio_bp.route("/", methods=["GET"])
     @jwt_required
@@ -11,4 +37,46 @@ def create_portfolio_routes(portfolio_service):
         data = portfolio_service.get_full_portfolio_view(g.username)
         return jsonify(data), 200
 
-    return portfolio_bp
\ No newline at end of file
+    @portfolio_bp.route("/history", methods=["GET"])
+    @jwt_required
+    def get_history():
+        if snapshot_service is None:
+            return jsonify({"error": "Portfolio history is not enabled"}), 404
+
+        try:
+            points = int(request.args.get("points", 300))
+            start = _parse_time(request.args.get("from"))
+            end = _parse_time(request.args.get("to"))
+        except (ValueError, TypeError):
+            return jsonify({
+                "error": "Invalid request",
+                "message": "points must be a number; from/to must be epoch seconds or ISO-8601"
+            }), 400
+
+        data = snapshot_service.history(g.username, points=points, start=start, end=end)
+        return jsonify(data), 200
+
+    @portfolio_bp.route("/stream", methods=["GET"])
+    @jwt_required
+    def stream_portfolio():
+        if stream_hub is None:
+            return jsonify({"error": "Portfolio stream is not enabled"}), 404
+
+        subscription = stream_hub.subscribe(g.username)
+
+        def events():
+            try:
+                while True:
+                    item = subscription.get(timeout=settings.PORTFOLIO_STREAM_KEEPALIVE_SECONDS)
+                    # Comment lines keep proxies from closing an idle stream
+                    yield _sse(*item) if item else ": keepalive\n\n"
+            finally:
+                stream_hub.unsubscribe(subscription)
+
+        return Response(
+            stream_with_context(events()),
+            mimetype="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    return portfolio_bp
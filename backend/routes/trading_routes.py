@@ -1,9 +1,9 @@
 from flask import Blueprint, request, jsonify, g
 from backend.middleware.auth_middleware import jwt_required
 
-trading_bp = Blueprint("trading", __name__)
 
 def create_trading_routes(trading_service):
+    trading_bp = Blueprint("trading", __name__)
 
     @trading_bp.route("/buy", methods=["POST"])
     @jwt_required
@@ -19,6 +19,9 @@ def create_trading_routes(trading_service):
             
             if not symbol:
                 return jsonify({"error": "Invalid request", "message": "Symbol is required"}), 400
+
+            if not isinstance(symbol, str):
+                return jsonify({"error": "Invalid request", "message": "Symbol must be a string"}), 400
             
             if not quantity:
                 return jsonify({"error": "Invalid request", "message": "Quantity is required"}), 400
@@ -49,6 +52,9 @@ def create_trading_routes(trading_service):
             
             if not symbol:
                 return jsonify({"error": "Invalid request", "message": "Symbol is required"}), 400
+
+            if not isinstance(symbol, str):
+                return jsonify({"error": "Invalid request", "message": "Symbol must be a string"}), 400
             
             if not quantity:
                 return jsonify({"error": "Invalid request", "message": "Quantity is required"}), 400
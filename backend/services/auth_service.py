@@ -6,10 +6,10 @@ from backend.repositories.portfolio_store_dynamo import PortfolioStoreDynamo
 
 
 class AuthService:
-    def __init__(self, user_store, notification_service=None):
+    def __init__(self, user_store, notification_service=None, portfolio_store=None):
         self.user_store = user_store
         self.notification_service = notification_service
-        self.portfolio_store = PortfolioStoreDynamo()
+        self.portfolio_store = portfolio_store if portfolio_store is not None else PortfolioStoreDynamo()
 
     def register_user(self, username, password):
         if not username or not password:
@@ -1,17 +1,102 @@
-import yfinance as yf
-from datetime import datetime
+from datetime import datetime, timedelta
 import math
+import threading
+from backend.config import settings
+from backend.services.quote_board import get_quote_board
+from backend.services.quote_fetcher import QuoteFetcher, CircuitBreaker, FRESH, MISSING
+from backend.services.market_calendar import MarketCalendar
+from backend.services.market_hours import ClosingSnapshot, MarketHoursPolicy, CLOSED
+from backend.services.symbol_index import SymbolNotFoundError, is_listed, negative_cache, validate_symbol
+from backend.services.upstream_scheduler import UpstreamScheduler, SharedTokenBucket, TRADE, PORTFOLIO, DASHBOARD
+
+
 class IndianMarketService:
 
     @staticmethod
-    def get_stock(symbol: str):
+    def get_stock(symbol: str, priority=TRADE):
+        """Fresh quote for ``symbol`` (trade path); never falls back to a stale price."""
+        status, quote, error = IndianMarketService._get_quotes(
+            [symbol], settings.TRADE_QUOTE_DEADLINE_SECONDS, priority
+        )[symbol.upper()]
+
+        # Outside market hours the closing price is the tradable price
+        if status not in (FRESH, CLOSED):
+            raise ValueError(error or f"Stock {symbol} not found or no data available")
+        return quote
+
+    @staticmethod
+    def get_quote(symbol: str, priority=DASHBOARD):
+        """Quote for display; may be the last known value, marked ``stale``."""
+        status, quote, error = IndianMarketService._get_quotes(
+            [symbol], settings.QUOTE_DEADLINE_SECONDS, priority
+        )[symbol.upper()]
+
+        if status == MISSING:
+            raise ValueError(error or f"Stock {symbol} not found or no data available")
+        return dict(quote, status=status)
+
+    @staticmethod
+    def _get_quotes(symbols, timeout, priority):
+        results = {}
+        remaining = []
+
+        policy = get_market_hours_policy()
+        market_closed = policy is not None and not policy.is_live()
+
+        # Serve from the shared quote board when a refresher is running
+        board = get_quote_board()
+        for symbol in symbols:
+            if not isinstance(symbol, str):
+                results[str(symbol)] = (MISSING, None, "Symbol must be a string")
+                continue
+
+            # Unknown and known-missing symbols never reach the provider
+            try:
+                validate_symbol(symbol)
+            except SymbolNotFoundError as e:
+                results[symbol.upper()] = (MISSING, None, str(e))
+                continue
+
+            # Prices don't move while the market is closed
+            if market_closed:
+                quote = policy.snapshot.get(symbol)
+                if quote is not None:
+                    results[symbol.upper()] = (CLOSED, quote, None)
+                    continue
+
+            quote = board.get(symbol, max_age=settings.QUOTE_BOARD_MAX_AGE_SECONDS) if board else None
+            if quote is not None:
+                results[symbol.upper()] = (FRESH, quote, None)
+            else:
+                if board is not None:
+                    board.request(symbol)
+                remaining.append(symbol)
+
+        if remaining:
+            fetched = get_quote_fetcher().get_many(remaining, timeout, priority)
+            if market_closed:
+                # First request for these symbols since close; keep them for the rest of the night
+                policy.snapshot.put_many([quote for status, quote, _ in fetched.values() if status == FRESH])
+            results.update(fetched)
+        return results
+
+    @staticmethod
+    def fetch_stock(symbol: str):
+        # yfinance pulls in pandas; import on first use to keep cold starts fast
+        import yfinance as yf
+
         try:
             ticker = yf.Ticker(f"{symbol}.NS")
 
             hist = ticker.history(period="5d")
 
             if hist.empty:
-                raise ValueError(f"Stock {symbol} not found or no data available")
+                # yfinance also answers empty on errors and rate limiting; a
+                # listed symbol exists, so treat that as a provider failure
+                if is_listed(symbol):
+                    raise ValueError(f"No data returned for {symbol}")
+                negative_cache.add(symbol)
+                raise SymbolNotFoundError(f"Stock {symbol} not found or no data available")
 
             last = hist.iloc[-1]
 
@@ -47,13 +132,93 @@ class IndianMarketService:
             raise ValueError(f"Error fetching stock data for {symbol}: {str(e)}")
 
     @staticmethod
-    def get_multiple(symbols: list):
+    def get_multiple(symbols: list, priority=DASHBOARD):
+        """
+        Quotes for ``symbols`` within the configured deadline. Every symbol is
+        present in the result with a ``status`` of fresh, stale or missing;
+        missing entries carry no price.
+        """
         results = []
 
-        for symbol in symbols:
-            try:
-                results.append(IndianMarketService.get_stock(symbol))
-            except:
-                continue
+        for symbol, (status, quote, error) in IndianMarketService._get_quotes(
+            symbols, settings.QUOTE_DEADLINE_SECONDS, priority
+        ).items():
+            if quote is None:
+                results.append({"symbol": symbol, "status": status, "error": error})
+            else:
+                results.append(dict(quote, status=status))
+
+        return results
+
+
+_fetcher = None
+_fetcher_lock = threading.Lock()
+_scheduler = None
+_market_hours = None
+
+
+def get_upstream_scheduler():
+    """Upstream budget (host-wide with UPSTREAM_BUCKET_PATH), or None when rate limiting is disabled."""
+    global _scheduler
+    if _scheduler is None and settings.UPSTREAM_RATE_PER_SECOND > 0:
+        with _fetcher_lock:
+            if _scheduler is None:
+                bucket = None
+                if settings.UPSTREAM_BUCKET_PATH:
+                    bucket = SharedTokenBucket(
+                        settings.UPSTREAM_BUCKET_PATH, settings.UPSTREAM_RATE_PER_SECOND, settings.UPSTREAM_BURST
+                    )
+                _scheduler = UpstreamScheduler(
+                    settings.UPSTREAM_RATE_PER_SECOND,
+                    settings.UPSTREAM_BURST,
+                    reserve=settings.UPSTREAM_TRADE_RESERVE,
+                    max_wait={
+                        PORTFOLIO: settings.UPSTREAM_PORTFOLIO_MAX_WAIT_SECONDS,
+                        DASHBOARD: settings.UPSTREAM_DASHBOARD_MAX_WAIT_SECONDS
+                    },
+                    bucket=bucket
+                )
+    return _scheduler
+
+
+def get_quote_fetcher():
+    global _fetcher
+    if _fetcher is None:
+        scheduler = get_upstream_scheduler()
+        with _fetcher_lock:
+            if _fetcher is None:
+                _fetcher = QuoteFetcher(
+                    IndianMarketService.fetch_stock,
+                    max_workers=settings.QUOTE_FETCH_WORKERS,
+                    hedge_after=settings.QUOTE_HEDGE_AFTER_SECONDS,
+                    breaker=CircuitBreaker(
+                        failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+                        reset_timeout=settings.CIRCUIT_RESET_SECONDS
+                    ),
+                    scheduler=scheduler,
+                    trade_workers=settings.QUOTE_TRADE_FETCH_WORKERS
+                )
+    return _fetcher
+
+
+def _fetch_for_snapshot(symbols):
+    results = get_quote_fetcher().get_many(symbols, settings.TRADE_QUOTE_DEADLINE_SECONDS, PORTFOLIO)
+    # Only quotes fetched now are closing prices; anything else could be intraday
+    return [quote for status, quote, _ in results.values() if status == FRESH]
+
 
-        return results
\ No newline at end of file
+def get_market_hours_policy():
+    """Process-wide market-hours policy, or None when disabled."""
+    global _market_hours
+    if _market_hours is None and settings.MARKET_HOURS_ENABLED == 'True':
+        with _fetcher_lock:
+            if _market_hours is None:
+                _market_hours = MarketHoursPolicy(
+                    MarketCalendar.from_settings(settings),
+                    ClosingSnapshot(settings.CLOSING_SNAPSHOT_PATH),
+                    fetch_many=_fetch_for_snapshot,
+                    known_symbols=lambda: get_quote_fetcher().known_symbols(),
+                    snapshot_delay=timedelta(minutes=settings.MARKET_SNAPSHOT_DELAY_MINUTES),
+                    warmup=timedelta(minutes=settings.MARKET_WARMUP_MINUTES)
+                )
+    return _market_hours
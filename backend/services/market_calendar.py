@@ -0,0 +1,70 @@
+from datetime import datetime, date, time, timedelta, timezone
+
+IST = timezone(timedelta(hours=5, minutes=30), "IST")
+
+
+class MarketCalendar:
+    """
+    NSE equity trading calendar: weekday sessions (09:15–15:30 IST by
+    default) minus a configurable list of exchange holidays.
+    """
+
+    def __init__(self, open_time=time(9, 15), close_time=time(15, 30), holidays=(), tz=IST):
+        self.open_time = open_time
+        self.close_time = close_time
+        self.holidays = set(holidays)
+        self.tz = tz
+
+    @classmethod
+    def from_settings(cls, settings):
+        holidays = [
+            date.fromisoformat(d.strip())
+            for d in settings.NSE_HOLIDAYS.split(",") if d.strip()
+        ]
+        return cls(
+            open_time=time.fromisoformat(settings.NSE_OPEN_TIME),
+            close_time=time.fromisoformat(settings.NSE_CLOSE_TIME),
+            holidays=holidays
+        )
+
+    def now(self):
+        return datetime.now(self.tz)
+
+    def is_trading_day(self, day):
+        return day.weekday() < 5 and day not in self.holidays
+
+    def session(self, day):
+        """(open, close) datetimes for ``day``'s session."""
+        return (
+            datetime.combine(day, self.open_time, self.tz),
+            datetime.combine(day, self.close_time, self.tz)
+        )
+
+    def is_open(self, now=None):
+        now = (now or self.now()).astimezone(self.tz)
+        if not self.is_trading_day(now.date()):
+            return False
+        open_at, close_at = self.session(now.date())
+        return open_at <= now < close_at
+
+    def next_open(self, now=None):
+        now = (now or self.now()).astimezone(self.tz)
+        day = now.date()
+        for _ in range(366):
+            if self.is_trading_day(day):
+                open_at, _ = self.session(day)
+                if open_at > now:
+                    return open_at
+            day += timedelta(days=1)
+        raise ValueError("No trading session within a year; check the holiday list")
+
+    def last_close(self, now=None):
+        now = (now or self.now()).astimezone(self.tz)
+        day = now.date()
+        for _ in range(366):
+            if self.is_trading_day(day):
+                _, close_at = self.session(day)
+                if close_at <= now:
+                    return close_at
+            day -= timedelta(days=1)
+        raise ValueError("No trading session within a year; check the holiday list")
@@ -0,0 +1,182 @@
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+CLOSED = "closed"
+
+
+class ClosingSnapshot:
+    """
+    Closing quotes for every known symbol, persisted as JSON so restarts
+    outside trading hours still serve prices without going upstream.
+
+    Every worker shares the file. Writes happen under ``locked()`` (an
+    flock on ``<path>.lock``), which reloads the file first, so one
+    worker's writes never drop symbols another worker added. Nothing slow
+    (like an upstream fetch) should run while the lock is held.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.session_close = None  # datetime of the session these quotes close
+        self._quotes = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        self._quotes = data.get("quotes", {})
+        if data.get("session_close"):
+            self.session_close = datetime.fromisoformat(data["session_close"])
+
+    def _persist(self):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({
+                "session_close": self.session_close.isoformat() if self.session_close else None,
+                "quotes": self._quotes
+            }, f)
+        # Atomic swap: other workers never read a half-written file
+        os.replace(tmp, self.path)
+
+    @contextmanager
+    def locked(self):
+        """Hold the snapshot for writing, with the latest copy from disk loaded."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._lock, open(self.path + ".lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                self._load()
+                yield self
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def get(self, symbol):
+        return self._quotes.get(symbol.upper())
+
+    def symbols(self):
+        return list(self._quotes)
+
+    def put_many(self, quotes):
+        """Merge ``quotes`` with one lock and one write, however many there are."""
+        if quotes:
+            with self.locked():
+                self.merge(quotes)
+
+    def merge(self, quotes):
+        """Add quotes to the current session's snapshot (call under ``locked()``)."""
+        self._quotes.update({q["symbol"].upper(): q for q in quotes})
+        self._persist()
+
+    def replace(self, quotes, session_close):
+        """
+        Start a new session's snapshot with exactly ``quotes`` (call under
+        ``locked()``). Symbols that weren't refreshed are dropped rather than
+        served with an older session's price.
+        """
+        self._quotes = {q["symbol"].upper(): q for q in quotes}
+        self.session_close = session_close
+        self._persist()
+
+
+class MarketHoursPolicy:
+    """
+    Decides whether quotes come from the provider (``live``) or from the
+    closing snapshot, and keeps the snapshot up to date.
+
+    The market is treated as live during the session, from ``warmup``
+    before the next open, and after a close until that session's snapshot
+    has been taken. A background thread takes the snapshot ``snapshot_delay``
+    after close and re-fetches every snapshot symbol during warm-up so the
+    caches are hot at the open.
+    """
+
+    def __init__(self, calendar, snapshot, fetch_many, known_symbols,
+                 snapshot_delay=timedelta(minutes=5), warmup=timedelta(minutes=10), poll_seconds=30):
+        self.calendar = calendar
+        self.snapshot = snapshot
+        self.fetch_many = fetch_many          # symbols → list of fresh quotes only
+        self.known_symbols = known_symbols    # () → symbols seen by this worker
+        self.snapshot_delay = snapshot_delay
+        self.warmup = warmup
+        self.poll_seconds = poll_seconds
+        self._warmed_for = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _snapshot_current(self, now):
+        return self.snapshot.session_close is not None and self.snapshot.session_close >= self.calendar.last_close(now)
+
+    def in_warmup(self, now=None):
+        now = now or self.calendar.now()
+        return self.calendar.next_open(now) - now <= self.warmup
+
+    def is_live(self, now=None):
+        now = now or self.calendar.now()
+        return self.calendar.is_open(now) or self.in_warmup(now) or not self._snapshot_current(now)
+
+    def take_snapshot(self, now=None):
+        now = now or self.calendar.now()
+        session_close = self.calendar.last_close(now)
+
+        # Workers that find another worker's snapshot on disk only fetch the
+        # symbols it didn't have. The lock is only held to read and write the
+        # file; the fetch runs without it so request-path writes never wait on it
+        with self.snapshot.locked() as snapshot:
+            if self._snapshot_current(now):
+                symbols = sorted(set(self.known_symbols()) - set(snapshot.symbols()))
+            else:
+                symbols = sorted(set(snapshot.symbols()) | set(self.known_symbols()))
+
+        quotes = self.fetch_many(symbols) if symbols else []
+
+        with self.snapshot.locked() as snapshot:
+            # Another worker may have started this session's snapshot meanwhile;
+            # add to it rather than replacing what it stored
+            if self._snapshot_current(now):
+                if quotes:
+                    snapshot.merge(quotes)
+            else:
+                snapshot.replace(quotes, session_close)
+        return len(quotes)
+
+    def warm_up(self, now=None):
+        now = now or self.calendar.now()
+        symbols = self.snapshot.symbols()
+        if symbols:
+            self.fetch_many(symbols)
+        self._warmed_for = self.calendar.next_open(now)
+
+    def tick(self, now=None):
+        now = now or self.calendar.now()
+        if self.calendar.is_open(now):
+            return
+        if self.in_warmup(now):
+            if self._warmed_for != self.calendar.next_open(now):
+                self.warm_up(now)
+        elif not self._snapshot_current(now) and now >= self.calendar.last_close(now) + self.snapshot_delay:
+            self.take_snapshot(now)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="market-hours", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"market hours tick failed: {e}")
+            self._stop.wait(self.poll_seconds)
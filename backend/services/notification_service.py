@@ -2,8 +2,15 @@ from backend.aws.aws_client import AWSClientFactory
 
 class NotificationService:
     def __init__(self, topic_arn: str):
-        self.sns = AWSClientFactory.sns()
         self.topic_arn = topic_arn
+        self._sns = None
+
+    @property
+    def sns(self):
+        # Client is built on first publish so app startup makes no AWS calls
+        if self._sns is None:
+            self._sns = AWSClientFactory.sns()
+        return self._sns
 
     def publish(self, message: str):
         return self.sns.publish(
@@ -1,4 +1,5 @@
 from backend.services.indian_market_service import IndianMarketService
+from backend.services.upstream_scheduler import PORTFOLIO
 
 
 class PortfolioService:
@@ -9,8 +10,35 @@ class PortfolioService:
         return self.portfolio_store.get_or_create(username)
 
     def add_stock(self, username, symbol, qty, price):
-        portfolio = self.get_portfolio(username)
+        with self.portfolio_store.transaction(username) as portfolio:
+            self._add_holding(portfolio, symbol, qty, price)
+
+    def remove_stock(self, username, symbol, qty):
+        with self.portfolio_store.transaction(username) as portfolio:
+            self._remove_holding(portfolio, symbol, qty)
+
+    def buy(self, username, symbol, qty, price):
+        total_cost = qty * price
+
+        # Balance check and update are applied as one store transaction
+        with self.portfolio_store.transaction(username) as portfolio:
+            if portfolio.cash_balance < total_cost:
+                raise ValueError("Insufficient balance")
+
+            portfolio.cash_balance -= total_cost
+            self._add_holding(portfolio, symbol, qty, price)
 
+        return portfolio
+
+    def sell(self, username, symbol, qty, price):
+        with self.portfolio_store.transaction(username) as portfolio:
+            self._remove_holding(portfolio, symbol, qty)
+            portfolio.cash_balance += qty * price
+
+        return portfolio
+
+    @staticmethod
+    def _add_holding(portfolio, symbol, qty, price):
         if symbol not in portfolio.holdings:
             portfolio.holdings[symbol] = {"qty": 0, "avg_price": 0}
 
@@ -20,9 +48,8 @@ class PortfolioService:
         holding["qty"] += qty
         holding["avg_price"] = total_cost / holding["qty"]
 
-    def remove_stock(self, username, symbol, qty):
-        portfolio = self.get_portfolio(username)
-
+    @staticmethod
+    def _remove_holding(portfolio, symbol, qty):
         if symbol not in portfolio.holdings:
             raise ValueError("Stock not owned")
 
@@ -40,9 +67,9 @@ class PortfolioService:
 
         symbols = list(portfolio.holdings.keys())
 
-        live_prices = IndianMarketService.get_multiple(symbols) if symbols else []
+        live_prices = IndianMarketService.get_multiple(symbols, PORTFOLIO) if symbols else []
 
-        price_map = {s["symbol"]: s["price"] for s in live_prices}
+        price_map = {s["symbol"]: s for s in live_prices if "price" in s}
 
         holdings_view = []
         total_invested = 0
@@ -51,7 +78,8 @@ class PortfolioService:
         for symbol, data in portfolio.holdings.items():
             qty = data["qty"]
             avg_price = data["avg_price"]
-            live_price = price_map.get(symbol, avg_price)
+            quote = price_map.get(symbol.upper())
+            live_price = quote["price"] if quote else avg_price
 
             invested = qty * avg_price
             current_value = qty * live_price
@@ -65,6 +93,7 @@ class PortfolioService:
                 "quantity": qty,
                 "avg_buy_price": avg_price,
                 "live_price": live_price,
+                "price_status": quote["status"] if quote else "missing",
                 "invested_value": invested,
                 "current_value": current_value,
                 "pnl": pnl
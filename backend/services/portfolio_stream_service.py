@@ -0,0 +1,301 @@
+import queue
+import threading
+import time
+from backend.services.indian_market_service import IndianMarketService
+from backend.services.upstream_scheduler import DASHBOARD
+
+
+class PortfolioView:
+    """
+    Materialized portfolio view for one user, kept in memory while a stream
+    is open. Price and holding changes touch only the affected holding and
+    adjust the totals by the difference, so nothing is recomputed or reloaded.
+    """
+
+    def __init__(self, data):
+        self.username = data["username"]
+        self.cash_balance = data["cash_balance"]
+        self.total_invested = data["total_invested"]
+        self.current_holdings_value = data["current_holdings_value"]
+        self.holdings = {h["symbol"].upper(): dict(h) for h in data["holdings"]}
+        self.version = 0  # bumped on every holdings/cash change
+
+    def totals(self):
+        return {
+            "cash_balance": self.cash_balance,
+            "total_invested": self.total_invested,
+            "current_holdings_value": self.current_holdings_value,
+            "net_worth": self.cash_balance + self.current_holdings_value
+        }
+
+    def to_dict(self):
+        return dict(self.totals(), username=self.username, holdings=list(self.holdings.values()))
+
+    def reprice(self, symbol, price, status):
+        """Apply a new price; returns the updated holding, or None if nothing changed."""
+        holding = self.holdings.get(symbol)
+        if holding is None or (holding["live_price"] == price and holding["price_status"] == status):
+            return None
+
+        current_value = holding["quantity"] * price
+        self.current_holdings_value += current_value - holding["current_value"]
+        holding.update(
+            live_price=price,
+            price_status=status,
+            current_value=current_value,
+            pnl=current_value - holding["invested_value"]
+        )
+        return dict(holding)
+
+    def apply_holding(self, symbol, data, price=None, status=None):
+        """
+        Replace one holding with the store's ``{"qty", "avg_price"}`` (None if
+        it was sold off). Without a ``price`` the current live price is kept.
+        Returns the updated holding, or None if the holding was removed.
+        """
+        key = symbol.upper()
+        old = self.holdings.pop(key, None)
+        if old is not None:
+            self.total_invested -= old["invested_value"]
+            self.current_holdings_value -= old["current_value"]
+
+        if data is None:
+            return None
+
+        qty = data["qty"]
+        avg_price = data["avg_price"]
+        if price is None:
+            price = old["live_price"] if old else avg_price
+            status = old["price_status"] if old else "missing"
+
+        invested = qty * avg_price
+        current_value = qty * price
+        self.total_invested += invested
+        self.current_holdings_value += current_value
+
+        self.holdings[key] = {
+            "symbol": old["symbol"] if old else symbol,
+            "quantity": qty,
+            "avg_buy_price": avg_price,
+            "live_price": price,
+            "price_status": status,
+            "invested_value": invested,
+            "current_value": current_value,
+            "pnl": current_value - invested
+        }
+        return dict(self.holdings[key])
+
+    def changed_symbols(self, portfolio):
+        """Symbols whose quantity or cost basis differs from ``portfolio``."""
+        stored = {symbol.upper(): (symbol, h) for symbol, h in portfolio.holdings.items()}
+        changed = []
+        for key in set(stored) | set(self.holdings):
+            symbol, data = stored.get(key, (key, None))
+            holding = self.holdings.get(key)
+            if data is None or holding is None or (
+                holding["quantity"] != data["qty"] or holding["avg_buy_price"] != data["avg_price"]
+            ):
+                changed.append((symbol, data))
+        return changed
+
+
+class Subscription:
+    def __init__(self, username, maxsize):
+        self.username = username
+        self.events = queue.Queue(maxsize=maxsize)
+
+    def get(self, timeout=None):
+        """Next ``(event, data)`` pair, or None if nothing arrived within ``timeout``."""
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class PortfolioStreamHub:
+    """
+    Fan-out hub behind ``/portfolio/stream``.
+
+    Holds one ``PortfolioView`` per user with an open stream. A single poller
+    thread fetches prices for the union of symbols held by streaming users
+    (one lookup per symbol, however many pages are open) and pushes a delta
+    to each affected user; trades update the view from the trade result.
+    Views are periodically re-checked against the store so trades placed on
+    another worker show up too.
+    """
+
+    def __init__(self, portfolio_service, fetch_prices=None, poll_interval=2.0,
+                 resync_interval=30.0, queue_size=100):
+        self.portfolio_service = portfolio_service
+        # Background refreshes must not compete with interactive portfolio views
+        self.fetch_prices = fetch_prices or (lambda symbols: IndianMarketService.get_multiple(symbols, DASHBOARD))
+        self.poll_interval = poll_interval
+        self.resync_interval = resync_interval
+        self.queue_size = queue_size
+
+        self._lock = threading.Lock()
+        self._views = {}        # username → PortfolioView
+        self._subscribers = {}  # username → list of Subscription
+        self._holders = {}      # symbol → set of usernames holding it
+        self._thread = None
+        self._stop = threading.Event()
+
+    def subscribe(self, username):
+        """Open a stream; the first event is always a full ``snapshot``."""
+        subscription = Subscription(username, self.queue_size)
+
+        with self._lock:
+            view = self._views.get(username)
+        loaded = view is None
+        if loaded:
+            # Only the first stream per user pays for a full load
+            view = PortfolioView(self.portfolio_service.get_full_portfolio_view(username))
+
+        with self._lock:
+            view = self._views.setdefault(username, view)
+            for symbol in view.holdings:
+                self._holders.setdefault(symbol, set()).add(username)
+            self._subscribers.setdefault(username, []).append(subscription)
+            subscription.events.put_nowait(("snapshot", view.to_dict()))
+            self._ensure_poller()
+
+        if loaded:
+            # on_trade skips users without a registered view, so a trade that
+            # landed during the load would otherwise wait for the next resync
+            self._resync_user(username)
+
+        return subscription
+
+    def unsubscribe(self, subscription):
+        username = subscription.username
+        with self._lock:
+            subscribers = self._subscribers.get(username, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+            if subscribers:
+                return
+
+            self._subscribers.pop(username, None)
+            view = self._views.pop(username, None)
+            for symbol in (view.holdings if view else ()):
+                self._unindex(symbol, username)
+
+    def watched_symbols(self):
+        with self._lock:
+            return sorted(self._holders)
+
+    def on_prices(self, quotes):
+        """Push price changes to every user holding the symbol."""
+        with self._lock:
+            for quote in quotes:
+                if "price" not in quote:
+                    continue
+                symbol = quote["symbol"].upper()
+                for username in self._holders.get(symbol, ()):
+                    view = self._views[username]
+                    holding = view.reprice(symbol, quote["price"], quote.get("status", "fresh"))
+                    if holding is not None:
+                        self._publish(username, {"holdings": [holding], "removed": [], **view.totals()})
+
+    def on_trade(self, username, symbol, portfolio, price):
+        """Apply a completed trade (``portfolio`` is the store's post-trade state)."""
+        with self._lock:
+            view = self._views.get(username)
+            if view is None:
+                return
+            view.cash_balance = portfolio.cash_balance
+            data = portfolio.holdings.get(symbol)
+            # The trade was priced from a fresh quote; use it as the live price
+            self._apply(username, view, [(symbol, data)], price, "fresh")
+
+    def resync(self):
+        """Pick up holdings changed outside this process (other workers, admin edits)."""
+        with self._lock:
+            usernames = list(self._views)
+
+        for username in usernames:
+            self._resync_user(username)
+
+    def _resync_user(self, username):
+        with self._lock:
+            view = self._views.get(username)
+            if view is None:
+                return
+            version = view.version
+
+        portfolio = self.portfolio_service.get_portfolio(username)
+        with self._lock:
+            view = self._views.get(username)
+            # A trade applied while the store was read is newer than this copy;
+            # the next resync picks up anything else
+            if view is None or view.version != version:
+                return
+            changed = view.changed_symbols(portfolio)
+            if not changed and view.cash_balance == portfolio.cash_balance:
+                return
+            view.cash_balance = portfolio.cash_balance
+            self._apply(username, view, changed)
+
+    def poll_once(self):
+        symbols = self.watched_symbols()
+        if symbols:
+            self.on_prices(self.fetch_prices(symbols))
+
+    def stop(self):
+        self._stop.set()
+
+    def _apply(self, username, view, changes, price=None, status=None):
+        view.version += 1
+        updated = []
+        removed = []
+        for symbol, data in changes:
+            holding = view.apply_holding(symbol, data, price, status)
+            if holding is None:
+                removed.append(symbol.upper())
+                self._unindex(symbol.upper(), username)
+            else:
+                updated.append(holding)
+                self._holders.setdefault(symbol.upper(), set()).add(username)
+        self._publish(username, {"holdings": updated, "removed": removed, **view.totals()})
+
+    def _unindex(self, symbol, username):
+        holders = self._holders.get(symbol)
+        if holders is not None:
+            holders.discard(username)
+            if not holders:
+                del self._holders[symbol]
+
+    def _publish(self, username, delta):
+        for subscription in self._subscribers.get(username, ()):
+            try:
+                subscription.events.put_nowait(("delta", delta))
+            except queue.Full:
+                # Client fell behind; replace its backlog with a fresh snapshot
+                while True:
+                    try:
+                        subscription.events.get_nowait()
+                    except queue.Empty:
+                        break
+                subscription.events.put_nowait(("snapshot", self._views[username].to_dict()))
+
+    def _ensure_poller(self):
+        # Called with the lock held
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="portfolio-stream", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        last_resync = time.monotonic()
+        while not self._stop.wait(self.poll_interval):
+            with self._lock:
+                if not self._views:
+                    # Last stream closed; the next subscriber restarts the poller
+                    self._thread = None
+                    return
+            try:
+                self.poll_once()
+                if time.monotonic() - last_resync >= self.resync_interval:
+                    last_resync = time.monotonic()
+                    self.resync()
+            except Exception as e:
+                print(f"portfolio stream poll failed: {e}")
@@ -0,0 +1,171 @@
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from flask import request
+
+
+class SamplingProfiler:
+    """
+    Opt-in sampling profiler for in-flight Flask requests.
+
+    While a window is open, a background thread periodically grabs the stack
+    of every worker thread that is currently serving a request and aggregates
+    them per route. When the window closes, one collapsed-stack file per route
+    (``<endpoint>.folded``, ready for flamegraph.pl / speedscope) is written to
+    a timestamped directory under ``output_dir``.
+    """
+
+    MAX_STACK_DEPTH = 128
+
+    def __init__(self, output_dir, default_rate_hz=100, default_duration=60, max_duration=300):
+        self.output_dir = output_dir
+        self.default_rate_hz = default_rate_hz
+        self.default_duration = default_duration
+        self.max_duration = max_duration
+
+        self._in_flight = {}  # thread ident → route label
+        self._labels = {}     # code object → frame label
+        self._lock = threading.Lock()
+        self._thread = None
+        self._last_session = None
+
+    # ------------------------------------------------------------------
+    # Flask integration
+    # ------------------------------------------------------------------
+    def init_app(self, app):
+        app.before_request(self._on_request_start)
+        app.teardown_request(self._on_request_end)
+
+    def _on_request_start(self):
+        self._in_flight[threading.get_ident()] = request.endpoint or "unmatched"
+
+    def _on_request_end(self, exc=None):
+        self._in_flight.pop(threading.get_ident(), None)
+
+    def install_signal_handler(self, signum=signal.SIGUSR2):
+        def handler(_signum, _frame):
+            # Runs on the main thread, possibly while it is inside start();
+            # never block on the session lock here
+            try:
+                self.start(blocking=False)
+            except ValueError:
+                pass
+
+        try:
+            signal.signal(signum, handler)
+            return True
+        except ValueError:
+            # Not on the main thread (e.g. some embedded servers)
+            return False
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration=None, rate_hz=None, blocking=True):
+        duration = float(duration or self.default_duration)
+        rate_hz = float(rate_hz or self.default_rate_hz)
+
+        if duration <= 0 or duration > self.max_duration:
+            raise ValueError(f"Duration must be between 0 and {self.max_duration} seconds")
+        if rate_hz <= 0 or rate_hz > 1000:
+            raise ValueError("Sample rate must be between 0 and 1000 Hz")
+
+        if not self._lock.acquire(blocking=blocking):
+            raise ValueError("A profiling session is already starting")
+        try:
+            if self.running:
+                raise ValueError("A profiling session is already running")
+
+            started_at = datetime.utcnow()
+            session = {
+                "started_at": started_at.isoformat(),
+                "duration_seconds": duration,
+                "rate_hz": rate_hz,
+                "output_dir": os.path.join(self.output_dir, started_at.strftime("%Y%m%dT%H%M%S")),
+                "samples": 0,
+                "routes": [],
+                "finished": False,
+            }
+            self._last_session = session
+            self._thread = threading.Thread(
+                target=self._run, args=(session,), name="sampling-profiler", daemon=True
+            )
+            self._thread.start()
+        finally:
+            self._lock.release()
+
+        return dict(session)
+
+    def wait(self, timeout=None):
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def status(self):
+        session = dict(self._last_session) if self._last_session else None
+        return {"running": self.running, "session": session}
+
+    def _run(self, session):
+        interval = 1.0 / session["rate_hz"]
+        deadline = time.monotonic() + session["duration_seconds"]
+        stacks = defaultdict(Counter)  # route → Counter(collapsed stack → count)
+        own_ident = threading.get_ident()
+
+        next_tick = time.monotonic()
+        while next_tick < deadline:
+            frames = sys._current_frames()
+            for ident, route in list(self._in_flight.items()):
+                if ident == own_ident:
+                    continue
+                frame = frames.get(ident)
+                if frame is not None:
+                    stacks[route][self._collapse(frame)] += 1
+            session["samples"] += 1
+            del frames
+
+            next_tick += interval
+            delay = next_tick - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind; skip missed ticks instead of bursting
+                next_tick = time.monotonic()
+
+        session["routes"] = self._write(session["output_dir"], stacks)
+        session["finished"] = True
+
+    def _collapse(self, frame):
+        parts = []
+        while frame is not None and len(parts) < self.MAX_STACK_DEPTH:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+                label = label.replace(";", ":")
+                self._labels[code] = label
+            parts.append(label)
+            frame = frame.f_back
+        parts.reverse()
+        return ";".join(parts)
+
+    @staticmethod
+    def _write(output_dir, stacks):
+        os.makedirs(output_dir, exist_ok=True)
+        written = []
+        for route, counter in stacks.items():
+            filename = re.sub(r"[^A-Za-z0-9_.-]", "_", route) + ".folded"
+            with open(os.path.join(output_dir, filename), "w") as f:
+                for stack, count in counter.most_common():
+                    f.write(f"{stack} {count}\n")
+            written.append({"route": route, "file": filename, "samples": sum(counter.values())})
+        return written
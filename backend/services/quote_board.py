@@ -0,0 +1,388 @@
+"""
+Cross-process quote board.
+
+A fixed-layout, mmap'd record array shared by every worker on a box. One
+refresher process (``python -m backend.services.quote_board``) owns the
+board and is its only writer; workers open it read-only and read quotes
+straight out of the mapping, without locks or IPC round trips.
+
+File layout (little-endian)::
+
+    header   64 bytes   magic, capacity, symbol count
+    symbols  capacity × 32 bytes   interned symbol names; slot index = symbol id
+    records  capacity × 72 bytes   seq + quote fields, one record per symbol id
+
+Each record is guarded by a seqlock: the writer bumps ``seq`` to an odd value,
+writes the fields, then bumps it to the next even value. Readers retry while
+``seq`` is odd or changed underneath them, so they never see a torn quote.
+
+Workers that miss a symbol append it to ``<path>.requests``; the refresher
+picks those up on its next cycle and starts publishing them once the
+provider has returned data for them.
+"""
+import argparse
+import math
+import mmap
+import os
+import re
+import struct
+import time
+from datetime import datetime, timedelta
+from backend.config import settings
+from backend.services.market_calendar import MarketCalendar
+from backend.services.quote_fetcher import FRESH, MISSING
+from backend.services.symbol_index import validate_symbol
+from backend.services.upstream_scheduler import PORTFOLIO
+
+MAGIC = b"QBOARD01"
+HEADER = struct.Struct("<8sII")          # magic, capacity, count
+HEADER_SIZE = 64
+SYMBOL_SIZE = 32
+SEQ = struct.Struct("<Q")
+FIELDS = struct.Struct("<dddddqdd")      # price, open, high, low, previous_close, volume, market_cap, updated_at
+RECORD_SIZE = SEQ.size + FIELDS.size
+
+COUNT_OFFSET = 12
+MAX_READ_RETRIES = 100
+MAX_REFRESH_MISSES = 10
+SYMBOL_PATTERN = re.compile(r"[A-Z0-9&-]+")
+
+
+def _file_size(capacity):
+    return HEADER_SIZE + capacity * (SYMBOL_SIZE + RECORD_SIZE)
+
+
+def _to_float(value):
+    return float("nan") if value is None else float(value)
+
+
+def _from_float(value):
+    return None if math.isnan(value) else value
+
+
+def is_board_symbol(symbol):
+    """NSE-style ASCII symbol short enough for a board slot."""
+    return len(symbol) < SYMBOL_SIZE and SYMBOL_PATTERN.fullmatch(symbol) is not None
+
+
+class _QuoteBoardBase:
+    def __init__(self, path):
+        self.path = path
+        self.requests_path = path + ".requests"
+        self.capacity = 0
+        self._mm = None
+        self._ids = {}  # symbol → id
+
+    def _symbols_offset(self, symbol_id):
+        return HEADER_SIZE + symbol_id * SYMBOL_SIZE
+
+    def _record_offset(self, symbol_id):
+        return HEADER_SIZE + self.capacity * SYMBOL_SIZE + symbol_id * RECORD_SIZE
+
+    def _count(self):
+        return struct.unpack_from("<I", self._mm, COUNT_OFFSET)[0]
+
+    def _load_ids(self):
+        for symbol_id in range(len(self._ids), self._count()):
+            raw = self._mm[self._symbols_offset(symbol_id):self._symbols_offset(symbol_id) + SYMBOL_SIZE]
+            self._ids[raw.rstrip(b"\0").decode("ascii")] = symbol_id
+
+    def symbols(self):
+        self._load_ids()
+        return list(self._ids)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+
+
+class QuoteBoardWriter(_QuoteBoardBase):
+    """Single-writer side of the board; only the refresher process uses it."""
+
+    def __init__(self, path, capacity=4096):
+        super().__init__(path)
+
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size == 0:
+                os.ftruncate(fd, _file_size(capacity))
+                self._mm = mmap.mmap(fd, _file_size(capacity))
+                HEADER.pack_into(self._mm, 0, MAGIC, capacity, 0)
+            else:
+                self._mm = mmap.mmap(fd, size)
+        finally:
+            os.close(fd)
+
+        magic, self.capacity, _ = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a quote board")
+
+        self._load_ids()
+        self._requests_offset = 0
+
+    def intern(self, symbol):
+        symbol = symbol.upper()
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is not None:
+            return symbol_id
+
+        encoded = symbol.encode("ascii")
+        if len(encoded) >= SYMBOL_SIZE:
+            raise ValueError(f"Symbol {symbol} is too long for the quote board")
+
+        symbol_id = self._count()
+        if symbol_id >= self.capacity:
+            raise ValueError("Quote board is full")
+
+        offset = self._symbols_offset(symbol_id)
+        self._mm[offset:offset + SYMBOL_SIZE] = encoded.ljust(SYMBOL_SIZE, b"\0")
+        # Publish the slot only after its name is written
+        struct.pack_into("<I", self._mm, COUNT_OFFSET, symbol_id + 1)
+        self._ids[symbol] = symbol_id
+        return symbol_id
+
+    def publish(self, quote):
+        offset = self._record_offset(self.intern(quote["symbol"]))
+        seq = SEQ.unpack_from(self._mm, offset)[0]
+
+        SEQ.pack_into(self._mm, offset, seq + 1)
+        FIELDS.pack_into(
+            self._mm, offset + SEQ.size,
+            float(quote["price"]),
+            _to_float(quote.get("open")),
+            _to_float(quote.get("high")),
+            _to_float(quote.get("low")),
+            _to_float(quote.get("previous_close")),
+            int(quote.get("volume") or 0),
+            _to_float(quote.get("market_cap")),
+            time.time()
+        )
+        SEQ.pack_into(self._mm, offset, seq + 2)
+
+    def pending_requests(self):
+        """Symbols workers asked for since the last call."""
+        try:
+            with open(self.requests_path, "rb") as f:
+                f.seek(self._requests_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+
+        # Only consume complete lines; a worker may be mid-append
+        end = data.rfind(b"\n") + 1
+        self._requests_offset += end
+        return [line.decode("ascii").strip().upper() for line in data[:end].splitlines() if line.strip()]
+
+
+class QuoteBoardReader(_QuoteBoardBase):
+    """Lock-free, read-only view of the board for worker processes."""
+
+    def __init__(self, path):
+        super().__init__(path)
+
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.capacity, _ = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a quote board")
+
+        self._requested = set()
+
+    def _symbol_id(self, symbol):
+        symbol_id = self._ids.get(symbol)
+        if symbol_id is None:
+            self._load_ids()
+            symbol_id = self._ids.get(symbol)
+        return symbol_id
+
+    def read(self, symbol):
+        """Raw field tuple for ``symbol``, or None if it was never published."""
+        symbol_id = self._symbol_id(symbol)
+        if symbol_id is None:
+            return None
+
+        mm = self._mm
+        offset = self._record_offset(symbol_id)
+        for _ in range(MAX_READ_RETRIES):
+            before = SEQ.unpack_from(mm, offset)[0]
+            if before & 1:
+                # Writer is mid-update (possibly descheduled); let it finish
+                time.sleep(0)
+                continue
+            fields = FIELDS.unpack_from(mm, offset + SEQ.size)
+            if SEQ.unpack_from(mm, offset)[0] == before:
+                return None if before == 0 else fields
+        return None
+
+    def get(self, symbol, max_age=None):
+        symbol = symbol.upper()
+        fields = self.read(symbol)
+        if fields is None:
+            return None
+
+        price, open_, high, low, previous_close, volume, market_cap, updated_at = fields
+        if max_age is not None and time.time() - updated_at > max_age:
+            return None
+
+        return {
+            "symbol": symbol,
+            "price": price,
+            "open": _from_float(open_),
+            "high": _from_float(high),
+            "low": _from_float(low),
+            "previous_close": _from_float(previous_close),
+            "volume": volume,
+            "market_cap": _from_float(market_cap),
+            "currency": "INR",
+            "timestamp": datetime.utcfromtimestamp(updated_at).isoformat()
+        }
+
+    def request(self, symbol):
+        """Ask the refresher to start publishing ``symbol`` (once per process)."""
+        symbol = symbol.upper()
+        # Requests come straight from user input; a newline or non-ASCII
+        # symbol must never reach the shared requests file
+        if symbol in self._requested or not is_board_symbol(symbol):
+            return
+        self._requested.add(symbol)
+        # O_APPEND writes of a short line are atomic across processes
+        fd = os.open(self.requests_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, symbol.encode("ascii") + b"\n")
+        finally:
+            os.close(fd)
+
+
+_reader = None
+
+
+def get_quote_board():
+    """Per-process reader for the configured board, or None when disabled/absent."""
+    global _reader
+    if not settings.QUOTE_BOARD_PATH:
+        return None
+    if _reader is None or _reader._mm is None:
+        try:
+            _reader = QuoteBoardReader(settings.QUOTE_BOARD_PATH)
+        except (FileNotFoundError, ValueError):
+            # Refresher not started yet; fall back to direct fetches
+            return None
+    return _reader
+
+
+class QuoteBoardRefresher:
+    """
+    One refresher pass at a time for the board's single writer.
+
+    Every pass fetches all symbols as one deadline-bounded batch. Symbols
+    requested by workers only get a (permanent) board slot once the
+    provider has returned data for them, and at most ``max_requested`` of
+    them do; a requested symbol that keeps failing is dropped after
+    ``max_misses`` passes. Pinned and already-published symbols are always
+    refreshed, so they survive provider outages.
+    """
+
+    def __init__(self, board, fetch_many, pinned=(), max_misses=MAX_REFRESH_MISSES, max_requested=1024):
+        self.board = board
+        self.fetch_many = fetch_many  # symbols → {symbol: (status, quote, error)}
+        self.max_misses = max_misses
+        self.max_requested = max_requested
+        self._pinned = {s.upper() for s in pinned}
+        self._candidates = {}  # requested symbol → failed passes; not on the board yet
+
+        for symbol in self._pinned:
+            board.intern(symbol)
+
+    def _requested_count(self):
+        return len(set(self.board.symbols()) - self._pinned) + len(self._candidates)
+
+    def _take_requests(self):
+        on_board = set(self.board.symbols())
+        for symbol in self.board.pending_requests():
+            if symbol in on_board or symbol in self._candidates:
+                continue
+            try:
+                if not is_board_symbol(symbol):
+                    raise ValueError("not a valid NSE symbol")
+                validate_symbol(symbol)
+            except ValueError as e:
+                print(f"quote board: skipping request for {symbol}: {e}")
+                continue
+            if self._requested_count() >= self.max_requested:
+                print(f"quote board: skipping request for {symbol}: request limit reached")
+                continue
+            self._candidates[symbol] = 0
+
+    def refresh(self):
+        self._take_requests()
+
+        symbols = sorted(set(self.board.symbols()) | set(self._candidates))
+        results = self.fetch_many(symbols) if symbols else {}
+
+        for symbol in symbols:
+            status, quote, error = results.get(symbol, (MISSING, None, None))
+            if status != FRESH:
+                if symbol in self._candidates:
+                    self._candidates[symbol] += 1
+                    if self._candidates[symbol] >= self.max_misses:
+                        del self._candidates[symbol]
+                if error:
+                    print(f"quote board: {error}")
+                continue
+
+            self._candidates.pop(symbol, None)
+            try:
+                self.board.publish(quote)
+            except ValueError as e:
+                print(f"quote board: {e}")
+
+
+def run_refresher(path, symbols, interval, capacity, max_requested=1024):
+    from backend.services.indian_market_service import get_quote_fetcher
+
+    board = QuoteBoardWriter(path, capacity=capacity)
+    # One parallel, deadline-bounded batch per pass: a pass never outlasts the
+    # interval, and it goes through the breaker and upstream budget
+    refresher = QuoteBoardRefresher(
+        board,
+        lambda batch: get_quote_fetcher().get_many(batch, interval, PORTFOLIO),
+        pinned=symbols,
+        max_requested=max_requested
+    )
+
+    calendar = MarketCalendar.from_settings(settings) if settings.MARKET_HOURS_ENABLED == 'True' else None
+    warmup = timedelta(minutes=settings.MARKET_WARMUP_MINUTES)
+
+    print(f"quote board refresher writing {path} every {interval}s")
+    while True:
+        started = time.monotonic()
+
+        # Nothing moves while NSE is closed; workers use the closing snapshot
+        if calendar is not None and not calendar.is_open() and calendar.next_open() - calendar.now() > warmup:
+            time.sleep(interval)
+            continue
+
+        refresher.refresh()
+
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh the shared quote board")
+    parser.add_argument("--path", default=settings.QUOTE_BOARD_PATH or "/dev/shm/quote_board")
+    parser.add_argument("--symbols", default=settings.QUOTE_BOARD_SYMBOLS, help="comma-separated symbols to preload")
+    parser.add_argument("--interval", type=float, default=settings.QUOTE_BOARD_REFRESH_SECONDS)
+    parser.add_argument("--capacity", type=int, default=4096)
+    parser.add_argument("--max-requested", type=int, default=1024, help="board slots available to worker requests")
+    args = parser.parse_args()
+
+    run_refresher(
+        args.path,
+        [s.strip() for s in args.symbols.split(",") if s.strip()],
+        args.interval,
+        args.capacity,
+        args.max_requested
+    )
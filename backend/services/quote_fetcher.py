@@ -0,0 +1,197 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from backend.services.symbol_index import SymbolNotFoundError
+from backend.services.upstream_scheduler import TRADE, DASHBOARD
+
+FRESH = "fresh"
+STALE = "stale"
+MISSING = "missing"
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    After ``failure_threshold`` failures in a row the circuit opens and
+    ``allow()`` returns False for ``reset_timeout`` seconds. It then lets a
+    single probe through (half-open); a success closes it again, a failure
+    re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def release(self):
+        """Give back a half-open probe that ``allow()`` granted but that proved nothing."""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                # Keep the original open time so the next call probes again
+                self.state = self.OPEN
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self.state = self.CLOSED
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class QuoteFetcher:
+    """
+    Latency-budgeted wrapper around a blocking per-symbol fetch function.
+
+    Every call gets a deadline. Symbols are fetched in parallel; a fetch that
+    hasn't returned after ``hedge_after`` seconds gets a second (hedged)
+    attempt, and whatever is still outstanding at the deadline is abandoned.
+    Each symbol comes back with a status:
+
+    * ``fresh``   – fetched within this call
+    * ``stale``   – fetch failed/timed out (or circuit open); last known quote
+    * ``missing`` – no quote available at all
+
+    Abandoned attempts keep running in the pool and still refresh the last
+    known quote when they finish. With a ``scheduler``, every attempt needs
+    an upstream token for the call's priority class first; attempts that are
+    shed fall back to the last known quote the same way. Trade attempts run
+    on their own pool so they never queue behind admitted (or abandoned)
+    portfolio and dashboard work.
+    """
+
+    def __init__(self, fetch, max_workers=16, hedge_after=0.75, breaker=None, scheduler=None, trade_workers=4):
+        self._fetch = fetch
+        self.hedge_after = hedge_after
+        self.breaker = breaker or CircuitBreaker()
+        self.scheduler = scheduler
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="quote-fetch")
+        self._trade_executor = ThreadPoolExecutor(max_workers=trade_workers, thread_name_prefix="quote-fetch-trade")
+        self._last_known = {}  # symbol → quote
+
+    def last_known(self, symbol):
+        return self._last_known.get(symbol.upper())
+
+    def known_symbols(self):
+        return list(self._last_known)
+
+    def _attempt(self, symbol):
+        try:
+            quote = self._fetch(symbol)
+        except SymbolNotFoundError:
+            # A missing symbol says nothing about provider health either way;
+            # just hand back a half-open probe so the next call probes again
+            self.breaker.release()
+            raise
+        except ValueError:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        self._last_known[symbol] = quote
+        return quote
+
+    def _submit(self, symbol, priority, wait, hedge=False):
+        """Start an attempt; returns ``(future, error)`` with one of them None."""
+        if not self.breaker.allow():
+            return None, "Market data provider unavailable (circuit open)"
+        # Acquire in the caller so queued low-priority work never blocks pool threads
+        if self.scheduler is not None and not self.scheduler.acquire(priority, timeout=wait, hedge=hedge):
+            if not hedge:
+                # A shed half-open probe must not leave the breaker waiting on it forever
+                self.breaker.release()
+            return None, "Upstream request budget exhausted"
+        executor = self._trade_executor if priority == TRADE else self._executor
+        return executor.submit(self._attempt, symbol), None
+
+    def get_many(self, symbols, timeout, priority=DASHBOARD):
+        """
+        Fetch ``symbols`` within ``timeout`` seconds as ``priority`` class.
+
+        Returns ``{symbol: (status, quote, error)}`` with upper-cased symbols.
+        """
+        deadline = time.monotonic() + timeout
+        hedge_at = time.monotonic() + self.hedge_after if self.hedge_after else None
+
+        attempts = {}  # symbol → list of futures
+        owner = {}     # future → symbol
+        results = {}
+        errors = {}
+
+        for symbol in dict.fromkeys(s.upper() for s in symbols):
+            future, error = self._submit(symbol, priority, max(0.0, deadline - time.monotonic()))
+            if future is None:
+                errors[symbol] = error
+                continue
+            attempts[symbol] = [future]
+            owner[future] = symbol
+
+        pending = set(owner)
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+
+            if hedge_at is not None and now >= hedge_at:
+                for symbol, futures in attempts.items():
+                    if symbol not in results and len(futures) == 1 and not futures[0].done():
+                        hedge, _ = self._submit(symbol, priority, 0, hedge=True)
+                        if hedge is not None:
+                            futures.append(hedge)
+                            owner[hedge] = symbol
+                            pending.add(hedge)
+                hedge_at = None
+
+            wake_at = min(deadline, hedge_at) if hedge_at is not None else deadline
+            done, pending = wait(pending, timeout=max(0.0, wake_at - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                symbol = owner[future]
+                if symbol in results:
+                    continue
+                try:
+                    results[symbol] = future.result()
+                except Exception as e:
+                    errors[symbol] = str(e)
+
+            # Drop duplicate attempts for symbols that are already resolved
+            pending = {f for f in pending if owner[f] not in results}
+
+        for future in pending:
+            symbol = owner[future]
+            if symbol not in results:
+                errors.setdefault(symbol, f"Timed out fetching {symbol}")
+
+        # Symbols that blew the deadline count against the upstream
+        for symbol in {owner[f] for f in pending} - set(results):
+            self.breaker.record_failure()
+
+        out = {}
+        for symbol in dict.fromkeys(s.upper() for s in symbols):
+            if symbol in results:
+                out[symbol] = (FRESH, results[symbol], None)
+            elif symbol in self._last_known:
+                out[symbol] = (STALE, self._last_known[symbol], errors.get(symbol))
+            else:
+                out[symbol] = (MISSING, None, errors.get(symbol))
+        return out
@@ -0,0 +1,91 @@
+import threading
+import time
+from datetime import datetime
+from backend.services.indian_market_service import IndianMarketService
+from backend.services.upstream_scheduler import PORTFOLIO
+from backend.utils.downsample import lttb
+
+
+class NetWorthSnapshotService:
+    """
+    Periodically records every user's net worth and cash into a net-worth
+    store and serves downsampled history for charts.
+    """
+
+    MAX_POINTS = 5000
+
+    def __init__(self, portfolio_store, networth_store, interval=60, flat_interval=3600):
+        self.portfolio_store = portfolio_store
+        self.networth_store = networth_store
+        self.interval = interval
+        self.flat_interval = flat_interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def snapshot_all(self, now=None):
+        portfolios = [self.portfolio_store.get_or_create(u) for u in self.portfolio_store.usernames()]
+
+        # One batched quote lookup for every held symbol across all users,
+        # bounded by the quote deadline like an interactive portfolio view
+        symbols = sorted({symbol.upper() for p in portfolios for symbol in p.holdings})
+        quotes = IndianMarketService.get_multiple(symbols, PORTFOLIO) if symbols else []
+        price_map = {q["symbol"]: q["price"] for q in quotes if "price" in q}
+
+        timestamp = int(now if now is not None else time.time())
+        recorded = 0
+        for portfolio in portfolios:
+            # History is append-only: skip this tick rather than record
+            # cost basis as market value for a holding without a price
+            if any(symbol.upper() not in price_map for symbol in portfolio.holdings):
+                continue
+
+            holdings_value = sum(
+                h["qty"] * price_map[symbol.upper()]
+                for symbol, h in portfolio.holdings.items()
+            )
+            if self.networth_store.append(
+                portfolio.username,
+                timestamp,
+                portfolio.cash_balance + holdings_value,
+                portfolio.cash_balance,
+                min_interval=self.interval / 2,
+                flat_interval=self.flat_interval
+            ):
+                recorded += 1
+        return recorded
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="networth-snapshots", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.snapshot_all()
+            except Exception as e:
+                print(f"net worth snapshot failed: {e}")
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def history(self, username, points=300, start=None, end=None):
+        points = max(2, min(int(points), self.MAX_POINTS))
+        series = self.networth_store.read(username, start, end)
+        sampled = lttb(series, points, y=lambda p: p[1])
+
+        return {
+            "username": username,
+            "total_points": len(series),
+            "points": [
+                {
+                    "timestamp": datetime.utcfromtimestamp(ts).isoformat(),
+                    "net_worth": net_worth,
+                    "cash": cash
+                }
+                for ts, net_worth, cash in sampled
+            ]
+        }
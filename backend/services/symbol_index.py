@@ -0,0 +1,187 @@
+import bisect
+import csv
+import difflib
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from backend.config import settings
+
+
+class SymbolNotFoundError(ValueError):
+    """The market data provider has no data for this symbol."""
+
+
+class SymbolIndex:
+    """
+    In-memory index of the NSE symbol universe.
+
+    Symbols and company-name words are kept in sorted arrays so prefix
+    lookups are a binary search; a difflib fallback catches typos when
+    nothing matches by prefix.
+    """
+
+    TYPO_LENGTH_BAND = 2
+
+    def __init__(self, entries):
+        self._names = {}  # symbol → company name
+        for symbol, name in entries:
+            self._names[symbol.strip().upper()] = name.strip()
+
+        self._symbols = sorted(self._names)
+        self._words = sorted(
+            (word, symbol)
+            for symbol, name in self._names.items()
+            for word in re.findall(r"[A-Z0-9&]+", name.upper())
+        )
+        self._word_keys = [word for word, _ in self._words]
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an NSE equity listing (``EQUITY_L.csv`` format: needs ``SYMBOL``
+        and ``NAME OF COMPANY`` columns; other columns are ignored).
+        """
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            header = [h.strip().upper() for h in next(reader)]
+            symbol_col = header.index("SYMBOL")
+            name_col = header.index("NAME OF COMPANY")
+            return cls(
+                (row[symbol_col], row[name_col])
+                for row in reader
+                if len(row) > max(symbol_col, name_col) and row[symbol_col].strip()
+            )
+
+    def __len__(self):
+        return len(self._symbols)
+
+    def __contains__(self, symbol):
+        return symbol.upper() in self._names
+
+    @staticmethod
+    def _prefix_range(keys, prefix):
+        lo = bisect.bisect_left(keys, prefix)
+        hi = bisect.bisect_left(keys, prefix + "\uffff", lo)
+        return lo, hi
+
+    def search(self, query, limit=10):
+        query = query.strip().upper()
+        if not query:
+            return []
+
+        matches = []
+        seen = set()
+
+        def add(symbol):
+            if symbol not in seen:
+                seen.add(symbol)
+                matches.append({"symbol": symbol, "name": self._names[symbol]})
+
+        # 1. Symbol prefix (exact match sorts first)
+        lo, hi = self._prefix_range(self._symbols, query)
+        for symbol in self._symbols[lo:min(hi, lo + limit)]:
+            add(symbol)
+
+        # 2. Company-name word prefix ("tata" → TCS, TATAMOTORS, ...)
+        if len(matches) < limit:
+            lo, hi = self._prefix_range(self._word_keys, query.split()[0])
+            for _, symbol in self._words[lo:hi]:
+                if len(matches) >= limit:
+                    break
+                add(symbol)
+
+        # 3. Typos: closest symbols by edit similarity. Runs on every
+        # keystroke, so only symbols sharing the first letter and of similar
+        # length are compared
+        if not matches:
+            lo, hi = self._prefix_range(self._symbols, query[0])
+            candidates = [s for s in self._symbols[lo:hi] if abs(len(s) - len(query)) <= self.TYPO_LENGTH_BAND]
+            for symbol in difflib.get_close_matches(query, candidates, n=limit, cutoff=0.7):
+                add(symbol)
+
+        return matches
+
+
+class NegativeCache:
+    """
+    Symbols the provider reported as missing, remembered for ``ttl`` seconds.
+
+    Keys come from user input, so the cache is bounded: expired entries are
+    swept on every add, and beyond ``max_size`` the oldest entry is dropped.
+    """
+
+    def __init__(self, ttl, max_size=10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._expiry = OrderedDict()  # symbol → monotonic expiry, oldest first
+        self._lock = threading.Lock()
+
+    def add(self, symbol):
+        now = time.monotonic()
+        with self._lock:
+            symbol = symbol.upper()
+            self._expiry.pop(symbol, None)
+            self._expiry[symbol] = now + self.ttl
+
+            # Same TTL for every entry, so insertion order is expiry order
+            while self._expiry:
+                oldest, expiry = next(iter(self._expiry.items()))
+                if expiry > now and len(self._expiry) <= self.max_size:
+                    break
+                del self._expiry[oldest]
+
+    def __len__(self):
+        return len(self._expiry)
+
+    def __contains__(self, symbol):
+        symbol = symbol.upper()
+        expiry = self._expiry.get(symbol)
+        if expiry is None:
+            return False
+        if expiry <= time.monotonic():
+            with self._lock:
+                self._expiry.pop(symbol, None)
+            return False
+        return True
+
+
+_index = None
+_index_loaded = False
+_index_lock = threading.Lock()
+
+negative_cache = NegativeCache(settings.NEGATIVE_CACHE_TTL_SECONDS)
+
+
+def get_symbol_index():
+    """Process-wide symbol index, or None when no listing file is configured."""
+    global _index, _index_loaded
+    if not _index_loaded:
+        with _index_lock:
+            if not _index_loaded:
+                path = settings.NSE_SYMBOLS_PATH
+                if path and os.path.exists(path):
+                    _index = SymbolIndex.load(path)
+                else:
+                    print(f"symbol index disabled: listing file {path!r} not found")
+                _index_loaded = True
+    return _index
+
+
+def is_listed(symbol):
+    index = get_symbol_index()
+    return index is not None and symbol in index
+
+
+def validate_symbol(symbol):
+    """Reject unknown or known-missing symbols before any upstream call."""
+    if symbol.upper() in negative_cache:
+        raise SymbolNotFoundError(f"Stock {symbol} not found or no data available")
+
+    if settings.SYMBOL_VALIDATION != 'True':
+        return
+
+    index = get_symbol_index()
+    if index is not None and symbol not in index:
+        raise SymbolNotFoundError(f"Unknown symbol {symbol}")
@@ -1,17 +1,17 @@
 from backend.services.indian_market_service import IndianMarketService
+from backend.services.upstream_scheduler import TRADE
 from backend.models.trade import Trade
 from backend.utils.notification_builder import build_trade_notification
 
 
 class TradingService:
-    def __init__(self, portfolio_service, notification_service=None):
+    def __init__(self, portfolio_service, notification_service=None, stream_hub=None):
         self.portfolio_service = portfolio_service
         self.notification_service = notification_service
+        self.stream_hub = stream_hub
 
     def buy_stock(self, username, symbol, quantity):
-        portfolio = self.portfolio_service.get_portfolio(username)
-
-        stock = IndianMarketService.get_stock(symbol)
+        stock = IndianMarketService.get_stock(symbol, TRADE)
         if stock is None:
             raise ValueError(f"Failed to fetch stock data for {symbol}")
 
@@ -22,14 +22,12 @@ class TradingService:
         if quantity <= 0:
             raise ValueError("Quantity must be greater than 0")
 
-        total_cost = current_price * quantity
-
-        if portfolio.cash_balance < total_cost:
-            raise ValueError("Insufficient balance")
-
         # Update portfolio
-        portfolio.cash_balance -= total_cost
-        self.portfolio_service.add_stock(username, symbol, quantity, current_price)
+        portfolio = self.portfolio_service.buy(username, symbol, quantity, current_price)
+
+        # Open portfolio streams update from the trade result, not a reload
+        if self.stream_hub:
+            self.stream_hub.on_trade(username, symbol, portfolio, current_price)
 
         trade = Trade(username, symbol, quantity, current_price, "BUY")
 
@@ -50,9 +48,7 @@ class TradingService:
         }
 
     def sell_stock(self, username, symbol, quantity):
-        portfolio = self.portfolio_service.get_portfolio(username)
-
-        stock = IndianMarketService.get_stock(symbol)
+        stock = IndianMarketService.get_stock(symbol, TRADE)
         if stock is None:
             raise ValueError(f"Failed to fetch stock data for {symbol}")
 
@@ -64,9 +60,11 @@ class TradingService:
             raise ValueError("Quantity must be greater than 0")
 
         # Update portfolio
-        self.portfolio_service.remove_stock(username, symbol, quantity)
-        total_gain = current_price * quantity
-        portfolio.cash_balance += total_gain
+        portfolio = self.portfolio_service.sell(username, symbol, quantity, current_price)
+
+        # Open portfolio streams update from the trade result, not a reload
+        if self.stream_hub:
+            self.stream_hub.on_trade(username, symbol, portfolio, current_price)
 
         trade = Trade(username, symbol, quantity, current_price, "SELL")
 
@@ -0,0 +1,189 @@
+import fcntl
+import heapq
+import itertools
+import os
+import struct
+import threading
+import time
+
+TRADE = 0
+PORTFOLIO = 1
+DASHBOARD = 2
+
+PRIORITY_NAMES = {TRADE: "trade", PORTFOLIO: "portfolio", DASHBOARD: "dashboard"}
+
+
+class LocalTokenBucket:
+    """Token bucket private to one process."""
+
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def take(self, floor):
+        """Take one token if that leaves at least ``floor``; returns True on success."""
+        with self._lock:
+            self._refill()
+            if self._tokens - 1 >= floor:
+                self._tokens -= 1
+                return True
+            return False
+
+    def peek(self):
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+
+class SharedTokenBucket:
+    """
+    Token bucket kept in a small file so every worker process on the host
+    draws from the same budget. The state is ``(tokens, updated_at)`` under
+    an exclusive ``flock``; a new (zeroed) file starts out full because it
+    refills from the epoch.
+    """
+
+    STATE = struct.Struct("<dd")
+
+    def __init__(self, path, rate, burst):
+        self.path = path
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._lock = threading.Lock()
+        self._fd = None
+        self._pid = None
+
+    def _open(self):
+        # Forked workers must not share the parent's file description (and its lock)
+        if self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            self._pid = os.getpid()
+        return self._fd
+
+    def _update(self, floor):
+        fd = self._open()
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            raw = os.pread(fd, self.STATE.size, 0)
+            tokens, updated = self.STATE.unpack(raw) if len(raw) == self.STATE.size else (0.0, 0.0)
+            now = time.time()
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate)
+            taken = floor is not None and tokens - 1 >= floor
+            if taken:
+                tokens -= 1
+            os.pwrite(fd, self.STATE.pack(tokens, now), 0)
+            return taken, tokens
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def take(self, floor):
+        with self._lock:
+            return self._update(floor)[0]
+
+    def peek(self):
+        with self._lock:
+            return self._update(None)[1]
+
+
+class UpstreamScheduler:
+    """
+    Token-bucket budget for upstream quote requests, shared by all request
+    threads and split by priority class. With a ``SharedTokenBucket`` the
+    budget is also shared by every worker process on the host; otherwise
+    each process has its own.
+
+    * Tokens refill at ``rate`` per second up to ``burst``.
+    * Higher classes win: a request only takes a token when no more
+      important request is queued, and lower classes cannot dip into the
+      last ``reserve * priority`` tokens, which stay available for trades.
+    * A request that cannot get a token waits up to its class's
+      ``max_wait`` (trades wait for their deadline); if that runs out it is
+      shed and the caller falls back to a cached quote.
+    """
+
+    def __init__(self, rate, burst, reserve=2, max_wait=None, bucket=None):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.reserve = reserve
+        self.max_wait = {TRADE: None, PORTFOLIO: 0.5, DASHBOARD: 0.0}
+        self.max_wait.update(max_wait or {})
+
+        self.bucket = bucket or LocalTokenBucket(rate, burst)
+        self._cond = threading.Condition()
+        self._waiters = []  # heap of (priority, seq)
+        self._seq = itertools.count()
+        self._stats = {
+            p: {"served": 0, "shed": 0, "hedges_skipped": 0, "queued": 0, "waiting": 0}
+            for p in PRIORITY_NAMES
+        }
+
+    def _floor(self, priority):
+        return self.reserve * priority
+
+    def acquire(self, priority, timeout=None, hedge=False):
+        """
+        Take one upstream token for a request of class ``priority``.
+
+        Waits at most ``timeout`` or the class's ``max_wait`` (whichever is
+        shorter). Returns False if the request was shed. A refused ``hedge``
+        is counted as a skipped hedge, not a shed request, since the primary
+        attempt is still running.
+        """
+        max_wait = self.max_wait.get(priority)
+        if max_wait is None or (timeout is not None and timeout < max_wait):
+            max_wait = timeout
+        deadline = None if max_wait is None else time.monotonic() + max_wait
+        stats = self._stats[priority]
+
+        with self._cond:
+            if not self._waiters and self.bucket.take(self._floor(priority)):
+                stats["served"] += 1
+                return True
+
+            if max_wait is not None and max_wait <= 0:
+                stats["hedges_skipped" if hedge else "shed"] += 1
+                return False
+
+            entry = (priority, next(self._seq))
+            heapq.heappush(self._waiters, entry)
+            stats["queued"] += 1
+            stats["waiting"] += 1
+            try:
+                while True:
+                    if self._waiters[0] == entry and self.bucket.take(self._floor(priority)):
+                        stats["served"] += 1
+                        return True
+
+                    needed = self._floor(priority) + 1 - self.bucket.peek()
+                    # Other processes may drain a shared bucket, so never sleep
+                    # past one token's worth of refill without rechecking
+                    wake = min(max(needed, 0.1), 1.0) / self.rate if self.rate > 0 else None
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            stats["hedges_skipped" if hedge else "shed"] += 1
+                            return False
+                        wake = remaining if wake is None else min(wake, remaining)
+                    self._cond.wait(wake)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                stats["waiting"] -= 1
+                self._cond.notify_all()
+
+    def metrics(self):
+        with self._cond:
+            return {
+                "rate_per_second": self.rate,
+                "burst": self.burst,
+                "tokens_available": round(self.bucket.peek(), 2),
+                "classes": {PRIORITY_NAMES[p]: dict(s) for p, s in self._stats.items()}
+            }
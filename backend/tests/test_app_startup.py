@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+from backend.app import create_app
+from backend.config import settings
+from backend.services import indian_market_service
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def test_import_does_not_load_heavy_dependencies():
+    code = (
+        "import sys, backend.app\n"
+        "heavy = [m for m in ('yfinance', 'pandas', 'boto3', 'flasgger') if m in sys.modules]\n"
+        "print(','.join(heavy))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == ""
+
+
+def test_create_app_can_build_multiple_apps(monkeypatch):
+    # Keep the market-hours background thread from writing a snapshot
+    monkeypatch.setattr(settings, "MARKET_HOURS_ENABLED", "False")
+    monkeypatch.setattr(indian_market_service, "_market_hours", None)
+
+    first = create_app()
+    second = create_app()
+
+    assert first is not second
+    assert second.test_client().get("/").status_code == 200
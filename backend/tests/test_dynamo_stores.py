@@ -3,6 +3,7 @@ import boto3
 from backend.repositories.user_store_dynamo import UserStoreDynamo
 from backend.repositories.portfolio_store_dynamo import PortfolioStoreDynamo
 from backend.models.user import User
+from backend.services.portfolio_service import PortfolioService
 
 @mock_aws
 def test_dynamo_stores():
@@ -32,4 +33,22 @@ def test_dynamo_stores():
     assert fetched.username == "aadi"
 
     portfolio = portfolio_store.get_or_create("aadi")
-    assert portfolio.username == "aadi"
\ No newline at end of file
+    assert portfolio.username == "aadi"
+
+
+@mock_aws
+def test_dynamo_portfolio_trade_roundtrip():
+    dynamodb = boto3.resource("dynamodb", region_name="ap-south-1")
+    dynamodb.create_table(
+        TableName="Portfolios",
+        KeySchema=[{"AttributeName": "username", "KeyType": "HASH"}],
+        AttributeDefinitions=[{"AttributeName": "username", "AttributeType": "S"}],
+        BillingMode="PAY_PER_REQUEST"
+    )
+
+    portfolio_service = PortfolioService(PortfolioStoreDynamo())
+    portfolio_service.buy("aadi", "TCS", 3, 3512.35)
+
+    portfolio = portfolio_service.get_portfolio("aadi")
+    assert portfolio.holdings["TCS"]["qty"] == 3
+    assert abs(portfolio.cash_balance - (100000 - 3 * 3512.35)) < 1e-6
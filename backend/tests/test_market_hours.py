@@ -0,0 +1,164 @@
+import fcntl
+from datetime import datetime, date
+
+from backend.services import indian_market_service
+from backend.services.indian_market_service import IndianMarketService
+from backend.services.market_calendar import MarketCalendar, IST
+from backend.services.market_hours import ClosingSnapshot, MarketHoursPolicy, CLOSED
+from backend.services.quote_fetcher import FRESH
+
+# 2026-10-16 is a Friday, 2026-10-19 a Monday, 2026-10-20 a (configured) holiday
+FRIDAY = date(2026, 10, 16)
+
+
+def ist(day, hour, minute=0):
+    return datetime(day.year, day.month, day.day, hour, minute, tzinfo=IST)
+
+
+def test_calendar_sessions_weekends_and_holidays():
+    calendar = MarketCalendar(holidays=[date(2026, 10, 20)])
+
+    assert calendar.is_open(ist(FRIDAY, 10))
+    assert not calendar.is_open(ist(FRIDAY, 9, 14))
+    assert not calendar.is_open(ist(FRIDAY, 15, 30))
+    assert not calendar.is_open(ist(date(2026, 10, 17), 11))
+    assert not calendar.is_open(ist(date(2026, 10, 20), 11))
+
+    assert calendar.next_open(ist(FRIDAY, 16)) == ist(date(2026, 10, 19), 9, 15)
+    assert calendar.next_open(ist(date(2026, 10, 19), 16)) == ist(date(2026, 10, 21), 9, 15)
+    assert calendar.last_close(ist(date(2026, 10, 19), 9)) == ist(FRIDAY, 15, 30)
+
+
+def test_policy_snapshots_after_close_and_warms_before_open(tmp_path):
+    fetched = []
+
+    def fetch_many(symbols):
+        fetched.append(list(symbols))
+        return [{"symbol": s, "price": 100.0} for s in symbols]
+
+    path = str(tmp_path / "closing.json")
+    policy = MarketHoursPolicy(
+        MarketCalendar(), ClosingSnapshot(path), fetch_many, known_symbols=lambda: ["TCS", "INFY"]
+    )
+
+    policy.tick(ist(FRIDAY, 12))
+    policy.tick(ist(FRIDAY, 15, 32))  # inside the post-close delay
+    assert fetched == []
+    assert policy.is_live(ist(FRIDAY, 15, 32))
+
+    policy.tick(ist(FRIDAY, 15, 40))
+    assert fetched == [["INFY", "TCS"]]
+    assert not policy.is_live(ist(date(2026, 10, 17), 12))
+
+    # Persisted: a restarted worker serves the same snapshot
+    reloaded = ClosingSnapshot(path)
+    assert reloaded.session_close == ist(FRIDAY, 15, 30)
+    assert reloaded.get("tcs")["price"] == 100.0
+
+    policy.tick(ist(date(2026, 10, 17), 12))
+    assert len(fetched) == 1
+
+    monday_warmup = ist(date(2026, 10, 19), 9, 8)
+    assert policy.is_live(monday_warmup)
+    policy.tick(monday_warmup)
+    policy.tick(ist(date(2026, 10, 19), 9, 9))
+    assert fetched[1:] == [["INFY", "TCS"]]
+
+
+def test_snapshot_drops_unrefreshed_symbols_and_merges_across_workers(tmp_path):
+    path = str(tmp_path / "closing.json")
+    snapshot = ClosingSnapshot(path)
+    with snapshot.locked():
+        snapshot.replace([{"symbol": "OLD", "price": 1.0}], ist(date(2026, 10, 15), 15, 30))
+
+    def fetch_many(symbols):
+        # OLD fails to refresh at this close
+        return [{"symbol": s, "price": 100.0} for s in symbols if s != "OLD"]
+
+    fetched = []
+
+    def tracking_fetch(symbols):
+        fetched.append(list(symbols))
+        return fetch_many(symbols)
+
+    first = MarketHoursPolicy(MarketCalendar(), snapshot, tracking_fetch, known_symbols=lambda: ["TCS"])
+    second = MarketHoursPolicy(
+        MarketCalendar(), ClosingSnapshot(path), tracking_fetch, known_symbols=lambda: ["TCS", "INFY"]
+    )
+
+    after_close = ist(FRIDAY, 15, 40)
+    first.tick(after_close)
+    second.tick(after_close)
+
+    # The second worker reuses the first one's sweep and only adds what it knew extra
+    assert fetched == [["OLD", "TCS"], ["INFY"]]
+    reloaded = ClosingSnapshot(path)
+    assert sorted(reloaded.symbols()) == ["INFY", "TCS"]
+    assert reloaded.get("OLD") is None
+
+
+def test_closed_market_serves_snapshot_without_upstream(tmp_path, monkeypatch):
+    snapshot = ClosingSnapshot(str(tmp_path / "closing.json"))
+    with snapshot.locked():
+        snapshot.replace([{"symbol": "TCS", "price": 3500.0}], ist(FRIDAY, 15, 30))
+
+    class ClosedPolicy:
+        def __init__(self):
+            self.snapshot = snapshot
+
+        def is_live(self):
+            return False
+
+    def no_upstream():
+        raise AssertionError("upstream must not be called")
+
+    monkeypatch.setattr(indian_market_service, "get_market_hours_policy", ClosedPolicy)
+    monkeypatch.setattr(indian_market_service, "get_quote_fetcher", no_upstream)
+
+    assert IndianMarketService.get_stock("TCS")["price"] == 3500.0
+    assert IndianMarketService.get_multiple(["TCS"])[0]["status"] == CLOSED
+
+
+def test_snapshot_fetch_runs_without_the_file_lock(tmp_path):
+    path = str(tmp_path / "closing.json")
+    snapshot = ClosingSnapshot(path)
+
+    def fetch_many(symbols):
+        # Another worker's request path must be able to write meanwhile
+        with open(path + ".lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            fcntl.flock(f, fcntl.LOCK_UN)
+        ClosingSnapshot(path).put_many([{"symbol": "INFY", "price": 1500.0}])
+        return [{"symbol": s, "price": 100.0} for s in symbols]
+
+    policy = MarketHoursPolicy(MarketCalendar(), snapshot, fetch_many, known_symbols=lambda: ["TCS"])
+    policy.take_snapshot(ist(FRIDAY, 15, 40))
+
+    reloaded = ClosingSnapshot(path)
+    assert sorted(reloaded.symbols()) == ["TCS"]
+    assert reloaded.session_close == ist(FRIDAY, 15, 30)
+
+
+def test_closed_market_writes_fetched_quotes_once_per_call(tmp_path, monkeypatch):
+    snapshot = ClosingSnapshot(str(tmp_path / "closing.json"))
+    writes = []
+    original = snapshot.merge
+    snapshot.merge = lambda quotes: writes.append(len(quotes)) or original(quotes)
+
+    class ClosedPolicy:
+        def __init__(self):
+            self.snapshot = snapshot
+
+        def is_live(self):
+            return False
+
+    class Fetcher:
+        def get_many(self, symbols, timeout, priority):
+            return {s: (FRESH, {"symbol": s, "price": 10.0}, None) for s in symbols}
+
+    monkeypatch.setattr(indian_market_service, "get_market_hours_policy", ClosedPolicy)
+    monkeypatch.setattr(indian_market_service, "get_quote_fetcher", Fetcher)
+
+    IndianMarketService.get_multiple(["TCS", "INFY", "RELIANCE"])
+    assert writes == [3]
+    assert sorted(snapshot.symbols()) == ["INFY", "RELIANCE", "TCS"]
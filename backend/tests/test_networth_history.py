@@ -0,0 +1,160 @@
+import boto3
+from flask import Flask
+from moto import mock_aws
+
+from backend.repositories.networth_store import NetWorthStore
+from backend.repositories.networth_store_dynamo import NetWorthStoreDynamo
+from backend.repositories.portfolio_store import PortfolioStore
+from backend.routes.portfolio_routes import create_portfolio_routes
+from backend.services.indian_market_service import IndianMarketService
+from backend.services.portfolio_service import PortfolioService
+from backend.services.token_service import TokenService
+from backend.services.upstream_scheduler import PORTFOLIO
+from backend.services.snapshot_service import NetWorthSnapshotService
+from backend.utils.delta_codec import encode_record, decode
+from backend.utils.downsample import lttb
+
+
+def test_delta_codec_roundtrip_ignores_truncated_tail():
+    records = [(1700000000, 10000000, 5000000), (1700000060, 10012550, 5000000), (1700000120, 9990000, 4000000)]
+    data = b"".join(encode_record(r, records[i - 1] if i else None) for i, r in enumerate(records))
+
+    assert decode(data, 3) == (records, len(data))
+    assert decode(data + b"\x85", 3) == (records, len(data))
+    # Minute-level points with small moves cost only a few bytes each
+    assert len(encode_record(records[1], records[0])) <= 5
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    points = [(i, 0.0) for i in range(1000)]
+    points[500] = (500, 100.0)
+
+    sampled = lttb(points, 50)
+    assert len(sampled) == 50
+    assert sampled[0] == points[0]
+    assert sampled[-1] == points[-1]
+    assert (500, 100.0) in sampled
+    assert lttb(points[:10], 50) == points[:10]
+
+
+def test_file_store_append_read_and_dedup(tmp_path):
+    store = NetWorthStore(str(tmp_path))
+
+    assert store.append("aadi", 1000, 100000.0, 100000.0)
+    assert not store.append("aadi", 1010, 100500.0, 90000.0, min_interval=30)
+    assert store.append("aadi", 1060, 100500.25, 90000.0, min_interval=30)
+    # Unchanged values are skipped until flat_interval has passed
+    assert not store.append("aadi", 1120, 100500.25, 90000.0, flat_interval=3600)
+    assert store.append("aadi", 4700, 100500.25, 90000.0, flat_interval=3600)
+
+    # A second handle (another worker) continues the same delta chain
+    other = NetWorthStore(str(tmp_path))
+    assert other.append("aadi", 4760, 99000.0, 90000.0)
+    assert store.append("aadi", 4820, 98000.0, 90000.0)
+
+    series = store.read("aadi")
+    assert series == [
+        (1000, 100000.0, 100000.0),
+        (1060, 100500.25, 90000.0),
+        (4700, 100500.25, 90000.0),
+        (4760, 99000.0, 90000.0),
+        (4820, 98000.0, 90000.0),
+    ]
+    assert store.read("aadi", start=4700, end=4760) == series[2:4]
+    assert store.read("nobody") == []
+
+
+@mock_aws
+def test_dynamo_store_append_and_read():
+    dynamodb = boto3.resource("dynamodb", region_name="ap-south-1")
+    dynamodb.create_table(
+        TableName="NetWorthHistory",
+        KeySchema=[
+            {"AttributeName": "username", "KeyType": "HASH"},
+            {"AttributeName": "day", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "username", "AttributeType": "S"},
+            {"AttributeName": "day", "AttributeType": "N"},
+        ],
+        BillingMode="PAY_PER_REQUEST"
+    )
+
+    store = NetWorthStoreDynamo()
+    assert store.append("aadi", 86400 - 60, 100000.0, 100000.0)
+    assert store.append("aadi", 86400, 100100.5, 100000.0)
+    assert store.append("aadi", 86460, 100200.0, 100000.0)
+    # Only the current day's tail is cached per user
+    assert store._last == {"aadi": (1, (86460, 10020000, 10000000))}
+
+    # A stale writer loses the conditional append instead of corrupting the chain
+    stale = NetWorthStoreDynamo()
+    stale._last["aadi"] = (1, (86400, 10010050, 10000000))
+    assert not stale.append("aadi", 86520, 1.0, 1.0)
+
+    assert NetWorthStoreDynamo().read("aadi") == [
+        (86340, 100000.0, 100000.0),
+        (86400, 100100.5, 100000.0),
+        (86460, 100200.0, 100000.0),
+    ]
+
+
+def test_snapshot_service_records_and_downsamples(tmp_path):
+    portfolio_store = PortfolioStore()
+    portfolio = portfolio_store.get_or_create("aadi")
+    portfolio.cash_balance = 1000.0
+
+    service = NetWorthSnapshotService(portfolio_store, NetWorthStore(str(tmp_path)), interval=60, flat_interval=0)
+    for minute in range(500):
+        portfolio.cash_balance = 1000.0 + minute
+        assert service.snapshot_all(now=1700000000 + minute * 60) == 1
+
+    history = service.history("aadi", points=100)
+    assert history["total_points"] == 500
+    assert len(history["points"]) == 100
+    assert history["points"][-1]["net_worth"] == 1499.0
+
+
+def test_history_route_rejects_non_finite_times_and_reports_disabled(tmp_path):
+    portfolio_store = PortfolioStore()
+    service = NetWorthSnapshotService(portfolio_store, NetWorthStore(str(tmp_path)))
+    headers = {"Authorization": f"Bearer {TokenService.generate_token('aadi')}"}
+
+    app = Flask(__name__)
+    app.register_blueprint(create_portfolio_routes(PortfolioService(portfolio_store), service), url_prefix="/portfolio")
+    client = app.test_client()
+    assert client.get("/portfolio/history?from=0&to=1700000000", headers=headers).status_code == 200
+    assert client.get("/portfolio/history?from=inf", headers=headers).status_code == 400
+    assert client.get("/portfolio/history?to=nan", headers=headers).status_code == 400
+
+    disabled = Flask(__name__)
+    disabled.register_blueprint(create_portfolio_routes(PortfolioService(portfolio_store)), url_prefix="/portfolio")
+    assert disabled.test_client().get("/portfolio/history", headers=headers).status_code == 404
+
+
+def test_snapshot_skips_users_with_unpriced_holdings(tmp_path, monkeypatch):
+    priorities = []
+
+    def get_multiple(symbols, priority=None):
+        priorities.append(priority)
+        # INFY was shed / timed out this tick
+        return [
+            {"symbol": s, "price": 200.0, "status": "fresh"} if s != "INFY" else {"symbol": s, "status": "missing"}
+            for s in symbols
+        ]
+
+    monkeypatch.setattr(IndianMarketService, "get_multiple", staticmethod(get_multiple))
+
+    portfolio_store = PortfolioStore()
+    priced = portfolio_store.get_or_create("priced")
+    priced.holdings = {"TCS": {"qty": 2, "avg_price": 100.0}}
+    partial = portfolio_store.get_or_create("partial")
+    partial.holdings = {"TCS": {"qty": 1, "avg_price": 100.0}, "INFY": {"qty": 1, "avg_price": 100.0}}
+
+    networth_store = NetWorthStore(str(tmp_path))
+    service = NetWorthSnapshotService(portfolio_store, networth_store)
+
+    assert service.snapshot_all(now=1700000000) == 1
+    assert priorities == [PORTFOLIO]
+    assert networth_store.read("priced") == [(1700000000, 100000.0 + 400.0, 100000.0)]
+    assert networth_store.read("partial") == []
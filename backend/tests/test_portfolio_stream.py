@@ -0,0 +1,183 @@
+import json
+
+import pytest
+from flask import Flask
+
+from backend.models.portfolio import Portfolio
+from backend.repositories.portfolio_store import PortfolioStore
+from backend.routes.portfolio_routes import create_portfolio_routes
+from backend.services.indian_market_service import IndianMarketService
+from backend.services.portfolio_service import PortfolioService
+from backend.services.portfolio_stream_service import PortfolioStreamHub
+from backend.services.token_service import TokenService
+from backend.services.trade_service import TradingService
+
+
+@pytest.fixture
+def prices(monkeypatch):
+    prices = {"TCS": 3500.0, "INFY": 1500.0}
+
+    def get_multiple(symbols, priority=None):
+        return [{"symbol": s.upper(), "price": prices[s.upper()], "status": "fresh"} for s in symbols]
+
+    monkeypatch.setattr(IndianMarketService, "get_multiple", staticmethod(get_multiple))
+    monkeypatch.setattr(
+        IndianMarketService, "get_stock", staticmethod(lambda symbol, priority=None: {"price": prices[symbol.upper()]})
+    )
+    return prices
+
+
+@pytest.fixture
+def portfolio_service():
+    service = PortfolioService(PortfolioStore())
+    service.buy("aadi", "TCS", 10, 3000.0)
+    service.buy("aadi", "INFY", 20, 1000.0)
+    return service
+
+
+def make_hub(portfolio_service, prices):
+    # A long poll interval keeps the background poller out of the way
+    return PortfolioStreamHub(
+        portfolio_service,
+        fetch_prices=lambda symbols: [{"symbol": s, "price": prices[s], "status": "fresh"} for s in symbols],
+        poll_interval=3600
+    )
+
+
+def test_price_change_updates_only_that_holding(portfolio_service, prices):
+    hub = make_hub(portfolio_service, prices)
+    sub = hub.subscribe("aadi")
+
+    event, snapshot = sub.get(timeout=1)
+    assert event == "snapshot"
+    assert snapshot["current_holdings_value"] == 10 * 3500.0 + 20 * 1500.0
+    assert hub.watched_symbols() == ["INFY", "TCS"]
+
+    hub.poll_once()
+    assert sub.get(timeout=0) is None  # unchanged prices push nothing
+
+    prices["TCS"] = 3600.0
+    hub.poll_once()
+    event, delta = sub.get(timeout=1)
+    assert event == "delta"
+    assert [h["symbol"] for h in delta["holdings"]] == ["TCS"]
+    assert delta["holdings"][0]["pnl"] == 10 * 600.0
+    assert delta["current_holdings_value"] == 10 * 3600.0 + 20 * 1500.0
+    assert delta["net_worth"] == delta["cash_balance"] + delta["current_holdings_value"]
+    assert sub.get(timeout=0) is None
+
+
+def test_trade_updates_view_without_reload(portfolio_service, prices):
+    hub = make_hub(portfolio_service, prices)
+    trading = TradingService(portfolio_service, stream_hub=hub)
+    sub = hub.subscribe("aadi")
+    sub.get(timeout=1)
+
+    loads = []
+    original = portfolio_service.get_full_portfolio_view
+    portfolio_service.get_full_portfolio_view = lambda u: loads.append(u) or original(u)
+
+    trading.sell_stock("aadi", "INFY", 20)
+    event, delta = sub.get(timeout=1)
+    assert event == "delta"
+    assert delta["removed"] == ["INFY"]
+    assert delta["current_holdings_value"] == 10 * 3500.0
+    assert hub.watched_symbols() == ["TCS"]
+
+    trading.buy_stock("aadi", "TCS", 10)
+    _, delta = sub.get(timeout=1)
+    assert delta["holdings"][0]["quantity"] == 20
+    assert delta["holdings"][0]["avg_buy_price"] == 3250.0
+    assert delta["total_invested"] == 20 * 3250.0
+    assert loads == []
+
+    # The view matches a full recomputation
+    full = original("aadi")
+    assert delta["cash_balance"] == full["cash_balance"]
+    assert delta["current_holdings_value"] == full["current_holdings_value"]
+
+    hub.unsubscribe(sub)
+    assert hub.watched_symbols() == []
+
+
+def test_resync_picks_up_trades_from_other_workers(portfolio_service, prices):
+    hub = make_hub(portfolio_service, prices)
+    sub = hub.subscribe("aadi")
+    sub.get(timeout=1)
+
+    # A trade that never went through this hub
+    portfolio_service.buy("aadi", "INFY", 5, 1500.0)
+    hub.resync()
+
+    _, delta = sub.get(timeout=1)
+    assert [h["symbol"] for h in delta["holdings"]] == ["INFY"]
+    assert delta["holdings"][0]["quantity"] == 25
+    hub.resync()
+    assert sub.get(timeout=0) is None
+
+
+def test_stream_route_sends_snapshot_event(portfolio_service, prices):
+    hub = make_hub(portfolio_service, prices)
+    app = Flask(__name__)
+    app.register_blueprint(create_portfolio_routes(portfolio_service, stream_hub=hub), url_prefix="/portfolio")
+
+    response = app.test_client().get(
+        "/portfolio/stream",
+        headers={"Authorization": f"Bearer {TokenService.generate_token('aadi')}"},
+        buffered=False
+    )
+    assert response.mimetype == "text/event-stream"
+
+    chunk = next(response.response).decode()
+    assert chunk.startswith("event: snapshot\ndata: ")
+    assert json.loads(chunk.split("data: ", 1)[1])["username"] == "aadi"
+    response.close()
+    assert hub.watched_symbols() == []
+
+
+def test_trade_during_initial_load_reaches_the_stream(portfolio_service, prices):
+    hub = make_hub(portfolio_service, prices)
+    trading = TradingService(portfolio_service, stream_hub=hub)
+
+    original = portfolio_service.get_full_portfolio_view
+
+    def load_then_trade(username):
+        view = original(username)
+        # The view isn't registered yet, so the hub can't apply this trade
+        trading.buy_stock(username, "TCS", 5)
+        return view
+
+    portfolio_service.get_full_portfolio_view = load_then_trade
+    sub = hub.subscribe("aadi")
+
+    event, snapshot = sub.get(timeout=1)
+    assert event == "snapshot"
+    event, delta = sub.get(timeout=1)
+    assert event == "delta"
+    assert delta["holdings"][0]["quantity"] == 15
+
+
+def test_resync_does_not_undo_a_trade_applied_while_reading_the_store(portfolio_service, prices):
+    hub = make_hub(portfolio_service, prices)
+    trading = TradingService(portfolio_service, stream_hub=hub)
+    sub = hub.subscribe("aadi")
+    sub.get(timeout=1)
+
+    original = portfolio_service.get_portfolio
+
+    def read_then_trade(username):
+        # The resync's copy is taken before a trade that the hub then applies
+        current = original(username)
+        stale = Portfolio(username, cash_balance=current.cash_balance)
+        stale.holdings = {s: dict(h) for s, h in current.holdings.items()}
+        portfolio_service.get_portfolio = original
+        trading.buy_stock(username, "TCS", 5)
+        return stale
+
+    portfolio_service.get_portfolio = read_then_trade
+    hub.resync()
+
+    _, delta = sub.get(timeout=1)
+    assert delta["holdings"][0]["quantity"] == 15
+    assert sub.get(timeout=0) is None
+    assert hub._views["aadi"].holdings["TCS"]["quantity"] == 15
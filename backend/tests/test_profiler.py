@@ -0,0 +1,76 @@
+import os
+import time
+
+from flask import Flask
+
+from backend.services.profiler_service import SamplingProfiler
+
+
+def busy_wait(seconds):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        pass
+
+
+def test_profiler_writes_collapsed_stacks_per_route(tmp_path):
+    app = Flask(__name__)
+
+    @app.route("/slow")
+    def slow():
+        busy_wait(0.3)
+        return {"ok": True}
+
+    @app.route("/fast")
+    def fast():
+        return {"ok": True}
+
+    profiler = SamplingProfiler(str(tmp_path), default_rate_hz=200, default_duration=0.5)
+    profiler.init_app(app)
+
+    session = profiler.start()
+    client = app.test_client()
+    assert client.get("/slow").status_code == 200
+    assert client.get("/fast").status_code == 200
+    profiler.wait(timeout=5)
+
+    status = profiler.status()
+    assert status["running"] is False
+    assert status["session"]["finished"] is True
+
+    folded = os.path.join(session["output_dir"], "slow.folded")
+    assert os.path.exists(folded)
+
+    with open(folded) as f:
+        lines = f.read().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert "busy_wait" in stack
+    assert ";" in stack
+
+
+def test_profiler_rejects_concurrent_sessions(tmp_path):
+    profiler = SamplingProfiler(str(tmp_path), default_duration=0.2)
+    profiler.start()
+    try:
+        profiler.start()
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    profiler.wait(timeout=5)
+
+
+def test_signal_start_does_not_block_on_held_lock(tmp_path):
+    profiler = SamplingProfiler(str(tmp_path), default_duration=0.2)
+
+    # Simulate the signal landing while start() holds the lock on this thread
+    profiler._lock.acquire()
+    try:
+        profiler.start(blocking=False)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    finally:
+        profiler._lock.release()
+
+    assert not profiler.running
@@ -0,0 +1,118 @@
+import time
+
+from backend.config import settings
+
+from backend.services.quote_board import QuoteBoardWriter, QuoteBoardReader, QuoteBoardRefresher, SEQ
+from backend.services.quote_fetcher import FRESH, MISSING
+
+
+def make_quote(symbol, price):
+    return {
+        "symbol": symbol,
+        "price": price,
+        "open": price - 1,
+        "high": price + 2,
+        "low": price - 2,
+        "previous_close": None,
+        "volume": 1200,
+        "market_cap": 1.5e12,
+    }
+
+
+def test_quote_board_publish_and_read(tmp_path):
+    path = str(tmp_path / "board")
+    writer = QuoteBoardWriter(path, capacity=8)
+    reader = QuoteBoardReader(path)
+
+    assert reader.get("TCS") is None
+
+    writer.publish(make_quote("TCS", 3500.5))
+    writer.publish(make_quote("INFY", 1500.0))
+    writer.publish(make_quote("TCS", 3510.0))
+
+    quote = reader.get("tcs")
+    assert quote["symbol"] == "TCS"
+    assert quote["price"] == 3510.0
+    assert quote["previous_close"] is None
+    assert quote["volume"] == 1200
+    assert reader.get("INFY")["price"] == 1500.0
+    assert sorted(reader.symbols()) == ["INFY", "TCS"]
+
+    # A reopened writer keeps the interned ids
+    assert QuoteBoardWriter(path).intern("INFY") == writer.intern("INFY")
+
+
+def test_quote_board_reader_skips_in_progress_writes(tmp_path):
+    path = str(tmp_path / "board")
+    writer = QuoteBoardWriter(path, capacity=8)
+    writer.publish(make_quote("TCS", 3500.0))
+    reader = QuoteBoardReader(path)
+
+    offset = writer._record_offset(writer.intern("TCS"))
+    seq = SEQ.unpack_from(writer._mm, offset)[0]
+    SEQ.pack_into(writer._mm, offset, seq + 1)  # writer "mid-update"
+    assert reader.get("TCS") is None
+
+    SEQ.pack_into(writer._mm, offset, seq + 2)
+    assert reader.get("TCS")["price"] == 3500.0
+
+
+def test_quote_board_max_age_and_requests(tmp_path):
+    path = str(tmp_path / "board")
+    writer = QuoteBoardWriter(path, capacity=8)
+    reader = QuoteBoardReader(path)
+
+    writer.publish(make_quote("TCS", 3500.0))
+    time.sleep(0.05)
+    assert reader.get("TCS", max_age=0.01) is None
+    assert reader.get("TCS", max_age=60) is not None
+
+    reader.request("wipro")
+    reader.request("WIPRO")
+    assert writer.pending_requests() == ["WIPRO"]
+    assert writer.pending_requests() == []
+
+
+def test_reader_ignores_malformed_requests(tmp_path):
+    path = str(tmp_path / "board")
+    QuoteBoardWriter(path, capacity=4)
+    reader = QuoteBoardReader(path)
+
+    reader.request("ÄBC")
+    reader.request("TCS\nFOO")
+    reader.request("X" * 40)
+    reader.request("m&m")
+
+    with open(path + ".requests") as f:
+        assert f.read() == "M&M\n"
+
+
+def test_refresher_only_interns_requests_that_return_data(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "SYMBOL_VALIDATION", "False")
+    path = str(tmp_path / "board")
+    batches = []
+
+    def fetch_many(symbols):
+        batches.append(list(symbols))
+        return {
+            s: (FRESH, make_quote(s, 100.0), None) if s in ("TCS", "INFY") else (MISSING, None, f"{s} not found")
+            for s in symbols
+        }
+
+    writer = QuoteBoardWriter(path, capacity=8)
+    refresher = QuoteBoardRefresher(writer, fetch_many, pinned=["TCS"], max_misses=2, max_requested=2)
+    reader = QuoteBoardReader(path)
+
+    for symbol in ["TYPOO", "INFY", "WIPRO"]:   # WIPRO is over the request limit
+        reader.request(symbol)
+    refresher.refresh()
+
+    assert batches == [["INFY", "TCS", "TYPOO"]]
+    assert sorted(reader.symbols()) == ["INFY", "TCS"]
+    assert reader.get("INFY")["price"] == 100.0
+
+    refresher.refresh()
+    refresher.refresh()
+    # Requested symbols that never returned data never took a slot and are dropped
+    assert batches[-1] == ["INFY", "TCS"]
+    assert sorted(reader.symbols()) == ["INFY", "TCS"]
@@ -0,0 +1,119 @@
+import threading
+import time
+
+from flask import Flask
+
+from backend.routes.market_routes import create_market_routes
+from backend.services.indian_market_service import IndianMarketService
+
+from backend.services.quote_fetcher import QuoteFetcher, CircuitBreaker, FRESH, STALE, MISSING
+from backend.services.symbol_index import SymbolNotFoundError
+
+
+def quote(symbol, price):
+    return {"symbol": symbol, "price": price}
+
+
+def test_fetcher_returns_partial_results_at_deadline():
+    release = threading.Event()
+
+    def fetch(symbol):
+        if symbol == "SLOW":
+            release.wait(5)
+        return quote(symbol, 100.0)
+
+    fetcher = QuoteFetcher(fetch, hedge_after=0)
+    started = time.monotonic()
+    results = fetcher.get_many(["tcs", "SLOW"], timeout=0.2)
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert elapsed < 1.0
+    assert results["TCS"][0] == FRESH
+    assert results["SLOW"][0] == MISSING
+    assert "Timed out" in results["SLOW"][2]
+
+
+def test_fetcher_serves_last_known_value_as_stale():
+    calls = {"n": 0}
+
+    def fetch(symbol):
+        calls["n"] += 1
+        if calls["n"] > 1:
+            raise ValueError("upstream down")
+        return quote(symbol, 3500.0)
+
+    fetcher = QuoteFetcher(fetch, hedge_after=0)
+    assert fetcher.get_many(["TCS"], timeout=1)["TCS"][0] == FRESH
+
+    status, cached, error = fetcher.get_many(["TCS"], timeout=1)["TCS"]
+    assert status == STALE
+    assert cached["price"] == 3500.0
+    assert error == "upstream down"
+
+
+def test_fetcher_hedges_slow_attempts():
+    first_call = threading.Event()
+
+    def fetch(symbol):
+        if not first_call.is_set():
+            first_call.set()
+            time.sleep(2)
+        return quote(symbol, 1.0)
+
+    fetcher = QuoteFetcher(fetch, hedge_after=0.05)
+    started = time.monotonic()
+    status, _, _ = fetcher.get_many(["INFY"], timeout=1)["INFY"]
+
+    assert status == FRESH
+    assert time.monotonic() - started < 1.0
+
+
+def test_circuit_breaker_stops_upstream_calls():
+    calls = {"n": 0}
+
+    def fetch(symbol):
+        calls["n"] += 1
+        raise ValueError("upstream down")
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    fetcher = QuoteFetcher(fetch, hedge_after=0, breaker=breaker)
+
+    fetcher.get_many(["A"], timeout=1)
+    fetcher.get_many(["B"], timeout=1)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    status, _, error = fetcher.get_many(["C"], timeout=1)["C"]
+    assert calls["n"] == 2
+    assert status == MISSING
+    assert "circuit open" in error
+
+    breaker.reset_timeout = 0
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_not_found_symbols_do_not_open_the_circuit():
+    def fetch(symbol):
+        raise SymbolNotFoundError(f"Stock {symbol} not found or no data available")
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    fetcher = QuoteFetcher(fetch, hedge_after=0, breaker=breaker)
+
+    for symbol in ["TYPO1", "TYPO2", "TYPO3"]:
+        assert fetcher.get_many([symbol], timeout=1)[symbol][0] == MISSING
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_non_string_symbols_are_rejected_not_crashing():
+    app = Flask(__name__)
+    app.register_blueprint(create_market_routes(), url_prefix="/market")
+
+    response = app.test_client().post("/market/prices", json={"symbols": [123]})
+    assert response.status_code == 400
+
+    assert IndianMarketService.get_multiple([123]) == [
+        {"symbol": "123", "status": MISSING, "error": "Symbol must be a string"}
+    ]
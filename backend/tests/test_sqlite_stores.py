@@ -0,0 +1,68 @@
+import multiprocessing
+
+from backend.models.user import User
+from backend.repositories.sqlite_db import SQLiteDatabase
+from backend.repositories.user_store_sqlite import UserStoreSqlite
+from backend.repositories.portfolio_store_sqlite import PortfolioStoreSqlite
+from backend.services.portfolio_service import PortfolioService
+
+
+def test_sqlite_stores(tmp_path):
+    path = str(tmp_path / "app.db")
+    db = SQLiteDatabase(path)
+    user_store = UserStoreSqlite(db)
+    portfolio_store = PortfolioStoreSqlite(db)
+
+    user_store.add_user(User("aadi", "hashed_pw"))
+    fetched = user_store.get_user("aadi")
+    assert fetched.username == "aadi"
+    assert fetched.password_hash == "hashed_pw"
+    assert user_store.get_user("missing") is None
+
+    portfolio = portfolio_store.get_or_create("aadi")
+    portfolio.cash_balance = 500
+    portfolio.holdings["TCS"] = {"qty": 2, "avg_price": 3500.0}
+    portfolio_store.save(portfolio)
+
+    # A second handle on the same file (another worker) sees the same data
+    other = PortfolioStoreSqlite(SQLiteDatabase(path)).get_or_create("aadi")
+    assert other.cash_balance == 500
+    assert other.holdings == {"TCS": {"qty": 2, "avg_price": 3500.0}}
+
+    assert db.connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_sqlite_trade_rolls_back_on_error(tmp_path):
+    service = PortfolioService(PortfolioStoreSqlite(SQLiteDatabase(str(tmp_path / "app.db"))))
+
+    try:
+        service.buy("aadi", "TCS", 1000, 3500.0)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+    portfolio = service.get_portfolio("aadi")
+    assert portfolio.cash_balance == 100000
+    assert portfolio.holdings == {}
+
+
+def _buy_many(path, count):
+    service = PortfolioService(PortfolioStoreSqlite(SQLiteDatabase(path)))
+    for _ in range(count):
+        service.buy("aadi", "INFY", 1, 100.0)
+
+
+def test_sqlite_trades_are_atomic_across_processes(tmp_path):
+    path = str(tmp_path / "app.db")
+    SQLiteDatabase(path)
+
+    workers = [multiprocessing.Process(target=_buy_many, args=(path, 25)) for _ in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(timeout=30)
+        assert w.exitcode == 0
+
+    portfolio = PortfolioStoreSqlite(SQLiteDatabase(path)).get_or_create("aadi")
+    assert portfolio.holdings["INFY"]["qty"] == 100
+    assert portfolio.cash_balance == 100000 - 100 * 100.0
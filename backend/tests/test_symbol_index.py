@@ -0,0 +1,119 @@
+import sys
+import types
+
+import pytest
+
+from backend.config import settings
+from backend.services import indian_market_service, symbol_index
+from backend.services.indian_market_service import IndianMarketService
+from backend.services.symbol_index import SymbolIndex, NegativeCache
+
+
+def build_index():
+    return SymbolIndex([
+        ("TCS", "Tata Consultancy Services Limited"),
+        ("TATAMOTORS", "Tata Motors Limited"),
+        ("TATASTEEL", "Tata Steel Limited"),
+        ("RELIANCE", "Reliance Industries Limited"),
+        ("INFY", "Infosys Limited"),
+    ])
+
+
+def test_symbol_index_prefix_name_and_fuzzy_search():
+    index = build_index()
+
+    assert [m["symbol"] for m in index.search("tata")] == ["TATAMOTORS", "TATASTEEL", "TCS"]
+    assert [m["symbol"] for m in index.search("TATAS")] == ["TATASTEEL"]
+    assert index.search("infosys")[0] == {"symbol": "INFY", "name": "Infosys Limited"}
+    assert [m["symbol"] for m in index.search("RELIANC3")] == ["RELIANCE"]
+    assert index.search("tata", limit=1) == [{"symbol": "TATAMOTORS", "name": "Tata Motors Limited"}]
+    assert "tcs" in index and "XYZ" not in index
+
+
+def test_symbol_index_loads_bundled_listing():
+    index = SymbolIndex.load(settings.NSE_SYMBOLS_PATH)
+    assert len(index) > 50
+    assert "RELIANCE" in index
+
+
+def test_negative_cache_expires():
+    cache = NegativeCache(ttl=0)
+    cache.add("gone")
+    assert "GONE" not in cache
+
+    cache.ttl = 60
+    cache.add("gone")
+    assert "GONE" in cache
+
+
+def test_negative_cache_is_bounded():
+    cache = NegativeCache(ttl=60, max_size=3)
+    for symbol in ["A", "B", "C", "D"]:
+        cache.add(symbol)
+    assert len(cache) == 3
+    assert "A" not in cache and "D" in cache
+
+    # Expired entries are swept on add without being looked up again
+    cache = NegativeCache(ttl=0)
+    for i in range(100):
+        cache.add(f"JUNK{i}")
+    assert len(cache) == 0
+
+
+def test_typo_fallback_only_compares_nearby_symbols(monkeypatch):
+    compared = []
+    original = symbol_index.difflib.get_close_matches
+
+    def spy(word, possibilities, **kwargs):
+        compared.extend(possibilities)
+        return original(word, possibilities, **kwargs)
+
+    monkeypatch.setattr(symbol_index.difflib, "get_close_matches", spy)
+    assert [m["symbol"] for m in build_index().search("INFYY")] == ["INFY"]
+    assert compared == ["INFY"]
+
+
+def test_unknown_symbols_rejected_before_upstream(monkeypatch):
+    def no_upstream():
+        raise AssertionError("upstream must not be called")
+
+    monkeypatch.setattr(settings, "SYMBOL_VALIDATION", "True")
+    monkeypatch.setattr(symbol_index, "_index", build_index())
+    monkeypatch.setattr(symbol_index, "_index_loaded", True)
+    monkeypatch.setattr(symbol_index, "negative_cache", NegativeCache(ttl=60))
+    monkeypatch.setattr(indian_market_service, "negative_cache", symbol_index.negative_cache)
+    monkeypatch.setattr(indian_market_service, "get_quote_fetcher", no_upstream)
+
+    with pytest.raises(ValueError, match="Unknown symbol"):
+        IndianMarketService.get_stock("TYPO")
+
+    symbol_index.negative_cache.add("TCS")
+    with pytest.raises(ValueError, match="not found"):
+        IndianMarketService.get_quote("TCS")
+
+    results = IndianMarketService.get_multiple(["TYPO", "TCS"])
+    assert [r["status"] for r in results] == ["missing", "missing"]
+
+
+def test_empty_history_only_negative_caches_unlisted_symbols(monkeypatch):
+    class EmptyTicker:
+        def __init__(self, name):
+            pass
+
+        def history(self, period):
+            return types.SimpleNamespace(empty=True)
+
+    monkeypatch.setitem(sys.modules, "yfinance", types.SimpleNamespace(Ticker=EmptyTicker))
+    monkeypatch.setattr(symbol_index, "_index", build_index())
+    monkeypatch.setattr(symbol_index, "_index_loaded", True)
+    monkeypatch.setattr(indian_market_service, "negative_cache", NegativeCache(ttl=60))
+
+    # A listed symbol with no data is a provider problem, not a missing symbol
+    with pytest.raises(ValueError) as excinfo:
+        IndianMarketService.fetch_stock("RELIANCE")
+    assert not isinstance(excinfo.value, symbol_index.SymbolNotFoundError)
+    assert "RELIANCE" not in indian_market_service.negative_cache
+
+    with pytest.raises(symbol_index.SymbolNotFoundError):
+        IndianMarketService.fetch_stock("NOTLISTED")
+    assert "NOTLISTED" in indian_market_service.negative_cache
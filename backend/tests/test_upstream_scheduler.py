@@ -0,0 +1,138 @@
+import threading
+import time
+
+from backend.services.quote_fetcher import QuoteFetcher, CircuitBreaker, STALE, MISSING, FRESH
+from backend.services.upstream_scheduler import UpstreamScheduler, SharedTokenBucket, TRADE, PORTFOLIO, DASHBOARD
+
+
+def test_lower_classes_cannot_drain_trade_reserve():
+    scheduler = UpstreamScheduler(rate=0.001, burst=5, reserve=2)
+
+    # Dashboard may only use tokens above 2 * reserve
+    assert scheduler.acquire(DASHBOARD)
+    assert not scheduler.acquire(DASHBOARD)
+    # Portfolio may go down to the reserve, then is shed after its wait
+    assert scheduler.acquire(PORTFOLIO, timeout=0)
+    assert scheduler.acquire(PORTFOLIO, timeout=0)
+    assert not scheduler.acquire(PORTFOLIO, timeout=0)
+    # Trades can use the reserve
+    assert scheduler.acquire(TRADE)
+    assert scheduler.acquire(TRADE)
+    assert not scheduler.acquire(TRADE, timeout=0.01)
+
+    classes = scheduler.metrics()["classes"]
+    assert classes["dashboard"] == {"served": 1, "shed": 1, "hedges_skipped": 0, "queued": 0, "waiting": 0}
+    assert classes["portfolio"]["served"] == 2 and classes["portfolio"]["shed"] == 1
+    assert classes["trade"]["served"] == 2 and classes["trade"]["queued"] == 1
+
+
+def test_queued_trade_is_served_before_queued_portfolio():
+    scheduler = UpstreamScheduler(rate=20, burst=1, reserve=0, max_wait={PORTFOLIO: 2})
+    assert scheduler.acquire(TRADE)
+
+    order = []
+
+    def worker(priority):
+        if scheduler.acquire(priority, timeout=2):
+            order.append(priority)
+
+    portfolio = threading.Thread(target=worker, args=(PORTFOLIO,))
+    portfolio.start()
+    time.sleep(0.01)
+    trade = threading.Thread(target=worker, args=(TRADE,))
+    trade.start()
+    portfolio.join()
+    trade.join()
+
+    assert order == [TRADE, PORTFOLIO]
+
+
+def test_fetcher_sheds_dashboard_reads_to_cached_values():
+    scheduler = UpstreamScheduler(rate=0.001, burst=1, reserve=0)
+    calls = []
+
+    def fetch(symbol):
+        calls.append(symbol)
+        return {"symbol": symbol, "price": 10.0}
+
+    fetcher = QuoteFetcher(fetch, hedge_after=0, scheduler=scheduler)
+    assert fetcher.get_many(["TCS"], timeout=1, priority=DASHBOARD)["TCS"][0] == FRESH
+
+    results = fetcher.get_many(["TCS", "INFY"], timeout=1, priority=DASHBOARD)
+    assert results["TCS"][0] == STALE
+    assert results["INFY"][0] == MISSING
+    assert results["INFY"][2] == "Upstream request budget exhausted"
+    assert calls == ["TCS"]
+
+
+def test_shed_half_open_probe_does_not_wedge_the_breaker():
+    # Plenty of tokens for trades, none for dashboard reads
+    scheduler = UpstreamScheduler(rate=0.001, burst=3, reserve=2)
+    calls = []
+
+    def fetch(symbol):
+        calls.append(symbol)
+        return {"symbol": symbol, "price": 10.0}
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+    fetcher = QuoteFetcher(fetch, hedge_after=0, breaker=breaker, scheduler=scheduler)
+
+    assert fetcher.get_many(["TCS"], timeout=1, priority=DASHBOARD)["TCS"][0] == MISSING
+    assert breaker.state == CircuitBreaker.OPEN
+
+    assert fetcher.get_many(["TCS"], timeout=1, priority=TRADE)["TCS"][0] == FRESH
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert calls == ["TCS"]
+
+
+def test_trade_fetches_do_not_queue_behind_dashboard_work():
+    release = threading.Event()
+
+    def fetch(symbol):
+        if symbol.startswith("SLOW"):
+            release.wait(5)
+        return {"symbol": symbol, "price": 10.0}
+
+    fetcher = QuoteFetcher(fetch, max_workers=2, hedge_after=0)
+    try:
+        # Both shared workers stay busy with abandoned dashboard fetches
+        fetcher.get_many(["SLOW1", "SLOW2"], timeout=0.05, priority=DASHBOARD)
+        assert fetcher.get_many(["TCS"], timeout=1, priority=TRADE)["TCS"][0] == FRESH
+    finally:
+        release.set()
+
+
+def test_schedulers_on_one_bucket_file_share_the_budget(tmp_path):
+    path = str(tmp_path / "bucket")
+    # Two workers on the same host
+    first = UpstreamScheduler(rate=0.001, burst=3, reserve=0, bucket=SharedTokenBucket(path, 0.001, 3))
+    second = UpstreamScheduler(rate=0.001, burst=3, reserve=0, bucket=SharedTokenBucket(path, 0.001, 3))
+
+    assert first.acquire(DASHBOARD)
+    assert second.acquire(DASHBOARD)
+    assert first.acquire(DASHBOARD)
+    assert not second.acquire(DASHBOARD)
+    assert not first.acquire(DASHBOARD)
+    assert first.metrics()["tokens_available"] == second.metrics()["tokens_available"] < 1
+
+
+def test_refused_hedges_are_not_counted_as_shed():
+    scheduler = UpstreamScheduler(rate=0.001, burst=1, reserve=0)
+    release = threading.Event()
+
+    def fetch(symbol):
+        release.wait(5)
+        return {"symbol": symbol, "price": 10.0}
+
+    fetcher = QuoteFetcher(fetch, hedge_after=0.01, scheduler=scheduler)
+    try:
+        # The primary attempt takes the only token; the hedge finds none
+        assert fetcher.get_many(["TCS"], timeout=0.1, priority=DASHBOARD)["TCS"][0] == MISSING
+    finally:
+        release.set()
+
+    dashboard = scheduler.metrics()["classes"]["dashboard"]
+    assert dashboard["served"] == 1
+    assert dashboard["shed"] == 0
+    assert dashboard["hedges_skipped"] == 1
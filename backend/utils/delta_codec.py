@@ -0,0 +1,66 @@
+"""
+Delta + varint encoding for append-only numeric series.
+
+A series is a list of integer tuples of a fixed width (e.g. ``(ts, net_worth,
+cash)`` in seconds/paise). Each record is stored as the difference from the
+previous record, zigzag-encoded and written as LEB128 varints, so a
+minute-level series whose values barely move costs a few bytes per point.
+The first record of a stream is encoded against all-zeros.
+"""
+
+
+def _zigzag(n):
+    return (n << 1) ^ (n >> 63)
+
+
+def _unzigzag(n):
+    return (n >> 1) ^ -(n & 1)
+
+
+def _write_varint(out, n):
+    while n > 0x7F:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def encode_record(record, previous=None):
+    out = bytearray()
+    previous = previous or (0,) * len(record)
+    for value, prev in zip(record, previous):
+        _write_varint(out, _zigzag(value - prev))
+    return bytes(out)
+
+
+def decode(data, width, previous=None):
+    """
+    Decode a stream of records into a list of tuples.
+
+    Returns ``(records, consumed)`` where ``consumed`` is the number of bytes
+    that formed complete records; a truncated trailing record (e.g. from an
+    interrupted append) is left out.
+    """
+    records = []
+    consumed = 0
+    current = list(previous or (0,) * width)
+    fields = []
+    shift = 0
+    n = 0
+
+    for offset, byte in enumerate(data):
+        n |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+
+        fields.append(_unzigzag(n))
+        n = 0
+        shift = 0
+        if len(fields) == width:
+            for i, delta in enumerate(fields):
+                current[i] += delta
+            records.append(tuple(current))
+            fields = []
+            consumed = offset + 1
+
+    return records, consumed
@@ -0,0 +1,43 @@
+def lttb(points, threshold, x=lambda p: p[0], y=lambda p: p[1]):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns at most ``threshold`` of ``points`` (always keeping the first and
+    last) chosen to preserve the visual shape of the series. ``x``/``y``
+    extract coordinates from each point, which is returned unchanged.
+    """
+    n = len(points)
+    if threshold >= n:
+        return list(points)
+    if threshold < 3:
+        return [points[0], points[-1]]
+
+    sampled = [points[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third triangle vertex
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        count = next_end - next_start
+        avg_x = sum(x(points[j]) for j in range(next_start, next_end)) / count
+        avg_y = sum(y(points[j]) for j in range(next_start, next_end)) / count
+
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = x(points[a]), y(points[a])
+
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (y(points[j]) - ay) - (ax - x(points[j])) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+
+        sampled.append(points[best])
+        a = best
+
+    sampled.append(points[-1])
+    return sampled